@@ -0,0 +1,79 @@
+"""First page load of a fresh server process, imports included, with cold and warm caches (run: python benchmarks/coldstart.py)"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import synthetic
+from pipeline import FEEDS, ROOT, VERSION, seed
+
+PACKAGE = os.path.join(ROOT, "fantasy_motogp_explorer")
+# Times loading the riders page in a fresh process, imports included, after optionally running ``prepare`` (as server
+# boot would). Only the time ``prepare`` spends waiting in ``pause`` is left out.
+SNIPPET = """
+import time
+
+start = time.perf_counter()
+paused = 0.0
+
+
+def new_stats():
+    from fantasy import FantasyStats
+
+    return FantasyStats(version={version!r}, base_url="http://localhost.invalid/", data_dir={data_dir!r})
+
+
+def pause(seconds: float):
+    global paused
+    before = time.perf_counter()
+    time.sleep(seconds)
+    paused += time.perf_counter() - before
+
+
+stats = None
+{prepare}
+stats = stats or new_stats()
+for name in ("basic_info", "stats", "history"):
+    getattr(stats.riders, name)
+print(time.perf_counter() - start - paused)
+"""
+# The page request arrives ``delay`` seconds after the welcome page started prewarming, and waits for what is left
+DURING_PREWARM = "import warmup; stats = new_stats(); warmup.prewarm_in_background(stats); pause({delay})"
+SCENARIOS = [
+    ("cold caches", "", True),
+    ("frames on disk", "", False),
+    ("during prewarm", DURING_PREWARM, True),
+    ("during prewarm, frames on disk", DURING_PREWARM, False),
+]
+
+
+def run(data_dir: str, prepare: str, delay: float) -> float:
+    code = SNIPPET.format(version=VERSION, data_dir=data_dir, prepare=prepare.format(delay=delay))
+    out = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE, capture_output=True, text=True, check=True)
+    return float(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--riders", type=int, default=25)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds from prewarm start to the page request")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed(data_dir, synthetic.payloads(n_riders=args.riders, n_events=args.events))
+        for name, prepare, cold in SCENARIOS:
+            timings = []
+            for _ in range(args.repeat):
+                if cold:
+                    for entity in FEEDS.values():
+                        shutil.rmtree(os.path.join(data_dir, entity, "frames"), ignore_errors=True)
+                timings.append(run(data_dir, prepare, args.delay))
+            print(f"{name:<30} first riders page {min(timings) * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Peak resident memory of downloading and of parsing large multi-season feeds (run: python benchmarks/ingest.py)
+
+Each stage runs in a fresh process, and the growth of its peak RSS over the freshly imported process is reported
+next to the size of the payloads. Pass ``--limit`` to fail when a stage grows the peak by more than that many MiB.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import synthetic
+from pipeline import ROOT, VERSION
+
+PACKAGE = os.path.join(ROOT, "fantasy_motogp_explorer")
+# Prints the RSS in MiB before running ``stage`` on ``stats`` and the peak RSS after. Where procfs allows it the
+# peak is reset first, otherwise the peak of the imports hides anything lower.
+SNIPPET = """
+import resource
+import sys
+
+from fantasy import FantasyStats
+
+
+def peak() -> float:
+    try:
+        with open("/proc/self/status", "r") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:")) / 2**10
+    except OSError:
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def reset_peak() -> float:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+    return peak()
+
+
+stats = FantasyStats(version={version!r}, base_url={base_url!r}, data_dir={data_dir!r})
+before = reset_peak()
+{stage}
+print(before, peak())
+"""
+STAGES = [
+    ("download", "stats.prefetch()"),
+    ("parse", "for entity in stats.entities:\n    entity._info"),
+    ("history", "stats.riders.history\nstats.weekends.events"),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(directory: str) -> tuple[subprocess.Popen, str]:
+    """Serve the files of ``directory`` over HTTP from another process, so they never count towards the peak"""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1", "--directory", directory],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/"
+
+
+def run(stage: str, base_url: str, data_dir: str) -> float:
+    """Growth of the RSS in MiB at its peak while running ``stage``"""
+    code = SNIPPET.format(version=VERSION, base_url=base_url, data_dir=data_dir, stage=stage)
+    out = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE, capture_output=True, text=True, check=True)
+    before, after = map(float, out.stdout.split())
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--riders", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20, help="events per season")
+    parser.add_argument("--seasons", type=int, default=20)
+    parser.add_argument("--limit", type=float, metavar="MIB", help="fail if a stage grows the peak RSS by more")
+    args = parser.parse_args()
+    payloads = synthetic.payloads(n_riders=args.riders, n_events=args.events, seasons=args.seasons)
+    with tempfile.TemporaryDirectory() as web_dir, tempfile.TemporaryDirectory() as data_dir:
+        size = 0
+        for feed, payload in payloads.items():
+            with open(os.path.join(web_dir, feed), "w") as f:
+                f.write(json.dumps(payload))
+            size += os.path.getsize(os.path.join(web_dir, feed))
+        del payloads
+        print(f"{'payloads':<10} {size / 2**20:8.1f} MiB")
+        server, base_url = serve(web_dir)
+        exceeded = []
+        try:
+            for name, stage in STAGES:
+                growth = run(stage, base_url, data_dir)
+                print(f"{name:<10} {growth:8.1f} MiB peak RSS growth")
+                if args.limit is not None and growth > args.limit:
+                    exceeded.append(name)
+        finally:
+            server.terminate()
+            server.wait()
+    if exceeded:
+        parser.exit(1, f"Peak RSS grew by more than {args.limit} MiB in: {', '.join(exceeded)}\n")
+
+
+if __name__ == "__main__":
+    main()
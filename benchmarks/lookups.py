@@ -0,0 +1,90 @@
+"""Point and range lookups on history and weekend sessions: boolean masks vs the indexed stores
+(run: python benchmarks/lookups.py)"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fantasy_motogp_explorer"))
+
+import pandas as pd  # noqa: E402
+import synthetic  # noqa: E402
+from fantasy import FantasyStats  # noqa: E402
+from pipeline import VERSION, seed  # noqa: E402
+
+
+def timed(lookup, keys: list, repeat: int) -> float:
+    """Best mean seconds per lookup over ``repeat`` passes through ``keys``"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            lookup(*key)
+        timings.append((time.perf_counter() - start) / len(keys))
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--riders", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20, help="events per season")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed(data_dir, synthetic.payloads(n_riders=args.riders, n_events=args.events, seasons=args.seasons))
+        stats = FantasyStats(version=VERSION, base_url="http://localhost.invalid/", data_dir=data_dir)
+        history, events = stats.riders.history, stats.weekends.events
+        start = time.perf_counter()
+        history_store, event_store = stats.riders.history_store, stats.weekends.event_store
+        print(f"{'build stores':<16} {(time.perf_counter() - start) * 1000:9.2f} ms for {len(history)} results")
+        rnd = random.Random(0)
+        ids, nums = history.index.unique().tolist(), history["Event Num"].unique().tolist()
+        weekends, sessions = events.index.unique().tolist(), event_store.sessions
+        cases = [
+            (
+                "rider x event",
+                [(rnd.choice(ids), rnd.choice(nums)) for _ in range(args.lookups)],
+                lambda i, n: history[(history.index == i) & (history["Event Num"] == n)],
+                history_store.get,
+            ),
+            (
+                "rider range",
+                [(rnd.choice(ids), 5, 10) for _ in range(args.lookups)],
+                lambda i, s, e: history[(history.index == i) & history["Event Num"].between(s, e)],
+                history_store.entity,
+            ),
+            (
+                "event",
+                [(rnd.choice(nums),) for _ in range(args.lookups)],
+                lambda n: history[history["Event Num"] == n],
+                history_store.event,
+            ),
+            (
+                "weekend",
+                [(rnd.choice(weekends),) for _ in range(args.lookups)],
+                lambda w: events[events.index == w],
+                event_store.weekend,
+            ),
+            (
+                "session",
+                [(rnd.choice(sessions), rnd.choice(weekends)) for _ in range(args.lookups)],
+                lambda s, w: events[(events["type"] == s) & (events.index == w)],
+                event_store.session,
+            ),
+        ]
+        for name, keys, mask, store in cases:
+            for key in keys[:10]:
+                pd.testing.assert_frame_equal(
+                    mask(*key).sort_index(kind="stable"), store(*key).sort_index(kind="stable")
+                )
+            masked, indexed = timed(mask, keys, args.repeat), timed(store, keys, args.repeat)
+            print(f"{name:<16} mask {masked * 1e6:9.1f} us  store {indexed * 1e6:9.1f} us  {masked / indexed:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
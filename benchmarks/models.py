@@ -0,0 +1,47 @@
+"""Parse time and memory of the data models for synthetic riders (run: python benchmarks/models.py)"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fantasy_motogp_explorer"))
+
+import synthetic  # noqa: E402
+from data_models.riders import Rider  # noqa: E402
+from data_models.weekends import Weekend  # noqa: E402
+
+
+def measure(cls, payload, repeat: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        [cls.from_dict(datum) for datum in payload]
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls.from_dict(datum) for datum in payload]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return min(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--riders", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for name, cls, payload in [
+        ("riders", Rider, synthetic.riders(n=args.riders, events=args.events)),
+        ("weekends", Weekend, synthetic.weekends(n=args.events)),
+    ]:
+        seconds, size = measure(cls, payload, args.repeat)
+        print(f"{name:<10} {len(payload):>6} items  {seconds * 1000:9.1f} ms  {size / 2**20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
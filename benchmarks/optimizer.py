@@ -0,0 +1,75 @@
+"""Lineup optimizer time for synthetic pools of growing size (run: python benchmarks/optimizer.py)"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fantasy_motogp_explorer"))
+
+import pandas as pd  # noqa: E402
+import synthetic  # noqa: E402
+from optimizer import SquadRules, optimize  # noqa: E402
+
+
+def pool(payload, team_key=None) -> pd.DataFrame:
+    ret = pd.DataFrame(
+        {
+            "cost": [datum["cost"] / 1000000 for datum in payload],
+            "points": [datum["stats"]["total_points"] for datum in payload],
+        },
+        index=pd.Index([datum["id"] for datum in payload], name="id"),
+    )
+    if team_key:
+        ret["team_id"] = [datum[team_key] for datum in payload]
+    return ret
+
+
+def brute_force(riders, constructors, teams, rules, top_k):
+    scores = []
+    for r, c, t in itertools.product(
+        itertools.combinations(riders.index, rules.riders),
+        itertools.combinations(constructors.index, rules.constructors),
+        itertools.combinations(teams.index, rules.teams),
+    ):
+        cost = riders.cost[list(r)].sum() + constructors.cost[list(c)].sum() + teams.cost[list(t)].sum()
+        per_team = riders.team_id[list(r)].value_counts().max()
+        if cost <= rules.budget + 1e-9 and (not rules.max_riders_per_team or per_team <= rules.max_riders_per_team):
+            scores.append(
+                riders.points[list(r)].sum() + constructors.points[list(c)].sum() + teams.points[list(t)].sum()
+            )
+    return sorted(scores, reverse=True)[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 250, 1000, 4000])
+    parser.add_argument("--budget", type=float, default=50)
+    parser.add_argument("--riders", type=int, default=2)
+    parser.add_argument("--max-per-team", type=int, default=1)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="compare the smallest pool against brute force")
+    args = parser.parse_args()
+    rules = SquadRules(budget=args.budget, riders=args.riders, max_riders_per_team=args.max_per_team)
+    for n in args.sizes:
+        teams, constructors = max(12, n // 2), max(6, n // 4)
+        riders = pool(synthetic.riders(n=n, events=1, teams=teams, constructors=constructors), "squad_id")
+        squads = pool(synthetic.squads(n=teams, events=1))
+        makers = pool(synthetic.constructors(n=constructors, events=1))
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            lineups = optimize(riders, makers, squads, rules, top_k=args.top_k)
+            timings.append(time.perf_counter() - start)
+        best = f"best {lineups.Points.iloc[0]:8.1f}" if len(lineups) else "no feasible lineup"
+        print(f"{n:>6} riders {teams:>5} teams {constructors:>5} constructors  {min(timings) * 1000:9.1f} ms  {best}")
+        if args.check and n == min(args.sizes):
+            expected = brute_force(riders, makers, squads, rules, args.top_k)
+            assert [round(x, 6) for x in lineups.Points] == [round(x, 6) for x in expected], "optimizer != brute force"
+            print("       matches brute force")
+
+
+if __name__ == "__main__":
+    main()
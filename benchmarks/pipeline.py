@@ -0,0 +1,161 @@
+"""Time and peak memory of each data pipeline stage on synthetic feeds (run: python benchmarks/pipeline.py)
+
+Results are stored as JSON per commit and scale under benchmarks/results, and ``--compare <commit>`` prints the
+change against a stored run of the same scale.
+
+Parsing streams the payload, so ``load`` decodes it on its own, ``parse`` is the whole parse and ``from_dict``,
+``_info`` and ``stack`` are its ``parse``, ``normalize`` and ``stack`` spans (time only).
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "fantasy_motogp_explorer"))
+
+import pandas as pd  # noqa: E402
+import synthetic  # noqa: E402
+from archive import Archive  # noqa: E402
+from fantasy import FantasyStats  # noqa: E402
+from spans import SPANS  # noqa: E402
+
+RESULTS = os.path.join(ROOT, "benchmarks", "results")
+VERSION = "20240101"
+# Feed file -> directory of the entity reading it
+FEEDS = {"riders.json": "rider", "squads.json": "team", "constructors.json": "constructor", "events.json": "weekend"}
+# (name, untimed setup, timed stage), run in order on one FantasyStats so each stage excludes the ones before it
+STAGES = [
+    ("load", None, lambda fs: deque(fs.riders.served.items(), maxlen=0)),
+    ("parse", None, lambda fs: fs.riders._info),
+    ("stats", lambda fs: fs.riders.info, lambda fs: fs.riders.stats),
+    ("history", None, lambda fs: fs.riders.history),
+    ("weekends.events", lambda fs: fs.weekends._info, lambda fs: fs.weekends.events),
+    (
+        "rider_full_data",
+        lambda fs: (fs.constructors.info, fs.teams.info, fs.weekends.info),
+        lambda fs: fs.rider_full_data,
+    ),
+]
+# Spans of the pipeline also reported as stages of their own (seconds only) -> their name in the results
+SPAN_STAGES = {"parse": "from_dict", "normalize": "_info", "stack": "stack"}
+
+
+def seed(data_dir: str, payloads: dict[str, list[dict]]):
+    for feed, name in FEEDS.items():
+        archive = Archive(os.path.join(data_dir, name))
+        with archive.lock():
+            archive.add(VERSION, json.dumps(payloads[feed]).encode())
+
+
+def run(payloads: dict[str, list[dict]], trace: bool) -> dict[str, dict]:
+    """One pass over every stage on a fresh data directory: seconds, or peak MiB when ``trace``"""
+    ret = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed(data_dir, payloads)
+        fs = FantasyStats(version=VERSION, base_url="http://localhost.invalid/", data_dir=data_dir)
+        if trace:
+            tracemalloc.start()
+        for name, setup, stage in STAGES:
+            try:
+                if setup:
+                    setup(fs)
+                if trace:
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                SPANS.clear()
+                start = time.perf_counter()
+                stage(fs)
+                seconds = time.perf_counter() - start
+            except Exception as exc:
+                ret[name] = {"error": repr(exc)}
+                continue
+            ret[name] = {"peak_mib": (tracemalloc.get_traced_memory()[1] - before) / 2**20} if trace else seconds
+            for record in SPANS.export():
+                if record["stage"] in SPAN_STAGES:
+                    split = SPAN_STAGES[record["stage"]]
+                    ret[split] = {} if trace else ret.get(split, 0) + record["seconds"]
+        if trace:
+            tracemalloc.stop()
+    return ret
+
+
+def measure(payloads: dict[str, list[dict]], repeat: int) -> dict[str, dict]:
+    timings = [run(payloads, trace=False) for _ in range(repeat)]
+    ret = run(payloads, trace=True)
+    for name, result in ret.items():
+        if "error" not in result:
+            result["seconds"] = min(timing[name] for timing in timings)
+    return ret
+
+
+def git(*args) -> str:
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+
+
+def result_path(commit: str, scale: dict) -> str:
+    return os.path.join(RESULTS, f"{commit}-{scale['riders']}x{scale['events']}x{scale['seasons']}.json")
+
+
+def report(stages: dict[str, dict], baseline: dict[str, dict] | None = None):
+    for name, result in stages.items():
+        if "error" in result:
+            print(f"{name:<16} failed: {result['error']}")
+            continue
+        peak = f"{result['peak_mib']:9.2f}" if "peak_mib" in result else f"{'-':>9}"
+        line = f"{name:<16} {result['seconds'] * 1000:10.1f} ms {peak} MiB"
+        previous = (baseline or {}).get(name, {})
+        if "seconds" in previous:
+            line += f"   {result['seconds'] / previous['seconds']:6.2f}x time"
+        if "peak_mib" in result and "peak_mib" in previous:
+            line += f" {result['peak_mib'] / max(previous['peak_mib'], 1e-9):6.2f}x memory"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--riders", type=int, default=25)
+    parser.add_argument("--events", type=int, default=20, help="events per season")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare", metavar="COMMIT", help="stored run to compare against")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+    scale = {"riders": args.riders, "events": args.events, "seasons": args.seasons}
+    payloads = synthetic.payloads(n_riders=args.riders, n_events=args.events, seasons=args.seasons)
+    stages = measure(payloads, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(result_path(args.compare, scale), "r") as f:
+            baseline = json.loads(f.read())["stages"]
+    report(stages, baseline)
+    if args.no_save:
+        return
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    result = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "scale": scale,
+        "stages": stages,
+    }
+    os.makedirs(RESULTS, exist_ok=True)
+    path = result_path(f"{commit}-dirty" if dirty else commit, scale)
+    with open(path, "w") as f:
+        f.write(json.dumps(result, indent=2))
+    print(f"Saved {os.path.relpath(path, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
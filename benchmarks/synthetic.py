@@ -0,0 +1,165 @@
+import random
+from datetime import datetime, timedelta
+
+STATUSES = ["active", "injured", "inactive"]
+COUNTRIES = ["ES", "IT", "FR", "PT", "AU", "JP", "ZA", "GB", "US", "TH"]
+SESSIONS = ["FP1", "PR", "Q1", "Q2", "SPR", "RAC"]
+
+
+def _prices(rng, n):
+    return {str(i): rng.randint(5, 25) * 100000 for i in range(1, n + 1)}
+
+
+def rider_event(rng):
+    final_points = rng.choice([0, rng.randint(1, 25)])
+    return {
+        "grid_position": rng.randint(1, 25),
+        "q1_position": rng.randint(0, 12),
+        "q2_position": rng.randint(0, 12),
+        "sprint_position": rng.randint(0, 22),
+        "final_position": rng.randint(1, 22),
+        "q1_points": rng.randint(0, 5),
+        "q2_points": rng.randint(0, 10),
+        "sprint_points": rng.randint(0, 12),
+        "final_points": final_points,
+        "qualifying_vs_final_position": rng.randint(-10, 10),
+        "qualifying_vs_final_position_points": rng.randint(-5, 5),
+        "points": rng.randint(0, 60),
+        "race_time": f"41:{rng.randint(10, 59)}.{rng.randint(100, 999)}",
+        "race_time_float": round(rng.uniform(2400, 2600), 3),
+        "fastest_lap": rng.choice([0, 0, 0, 1]),
+    }
+
+
+def group_event(rng):
+    return {
+        "points": rng.randint(0, 120),
+        "highest_position": rng.randint(1, 22),
+        "fastest_lap": rng.choice([0, 0, 1]),
+        "race_time": f"41:{rng.randint(10, 59)}.{rng.randint(100, 999)}",
+        "race_time_float": round(rng.uniform(2400, 2600), 3),
+    }
+
+
+def riders(n=25, events=20, teams=12, constructors=6, seed=0):
+    rng = random.Random(seed)
+    ret = []
+    for i in range(1, n + 1):
+        ret.append(
+            {
+                "id": i,
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "country": rng.choice(COUNTRIES),
+                "number": i,
+                "status": rng.choice(STATUSES),
+                "constructor_id": rng.randint(1, constructors),
+                "squad_id": rng.randint(1, teams),
+                "cost": rng.randint(5, 25) * 1000000,
+                "stats": {
+                    "wpr_history": {},
+                    "avg_points": rng.uniform(0, 40),
+                    "podium": rng.randint(0, 10),
+                    "last_event": rng.uniform(0, 60),
+                    "last_3_events": rng.uniform(0, 60),
+                    "last_5_events": rng.uniform(0, 60),
+                    "season_points": rng.uniform(0, 400),
+                    "starts": events,
+                    "avg_qualifying_pos": rng.uniform(1, 22),
+                    "is_prev_season": 0,
+                    "cost_dynamic": rng.randint(5, 25) * 1000000,
+                    "total_points": rng.uniform(0, 800),
+                    "avg_grid_pos": rng.uniform(1, 22),
+                    "avg_finishing_pos": rng.uniform(1, 22),
+                    "prices": _prices(rng, events),
+                    "events": {str(e): rider_event(rng) for e in range(1, events + 1)},
+                },
+            }
+        )
+    return ret
+
+
+def _groups(n, events, seed, extra):
+    rng = random.Random(seed)
+    ret = []
+    for i in range(1, n + 1):
+        ret.append(
+            {
+                "id": i,
+                "name": f"Group {i}",
+                "num_riders": 2,
+                "cost": rng.randint(5, 25) * 1000000,
+                **extra(rng),
+                "stats": {
+                    "podiums": rng.randint(0, 10),
+                    "num_riders": 2,
+                    "avg_grid_pos": rng.uniform(1, 22),
+                    "avg_finishing_pos": rng.uniform(1, 22),
+                    "total_fantasy_points": rng.uniform(0, 800),
+                    "fantasy_pos": rng.randint(1, n),
+                    "total_gp_points": rng.uniform(0, 400),
+                    "gp_pos": rng.randint(1, n),
+                    "total_points": rng.uniform(0, 800),
+                    "prices": _prices(rng, events),
+                    "events": {str(e): group_event(rng) for e in range(1, events + 1)},
+                },
+            }
+        )
+    return ret
+
+
+def squads(n=12, events=20, seed=1):
+    return _groups(n, events, seed, lambda rng: {"is_wildcard": rng.choice([0, 0, 1])})
+
+
+def constructors(n=6, events=20, seed=2):
+    return _groups(n, events, seed, lambda rng: {})
+
+
+def weekends(n=20, seed=3, start=datetime(2024, 3, 8, 10, 0)):
+    rng = random.Random(seed)
+    ret = []
+    event_id = 1
+    for i in range(1, n + 1):
+        weekend_start = start + timedelta(days=14 * (i - 1))
+        races = []
+        for j, session in enumerate(SESSIONS):
+            session_start = weekend_start + timedelta(hours=5 * j)
+            races.append(
+                {
+                    "id": event_id,
+                    "type": session,
+                    "status": "finished" if i <= n // 2 else "not-started",
+                    "is_race2": int(session == "SPR"),
+                    "start": session_start.isoformat() + "+00:00",
+                    "end": (session_start + timedelta(minutes=45)).isoformat() + "+00:00",
+                }
+            )
+            event_id += 1
+        ret.append(
+            {
+                "id": i,
+                "name": f"Grand Prix {i}",
+                "circuit": f"Circuit {i}",
+                "displayed_name": f"GP {i}",
+                "short_name": f"G{i:02d}",
+                "position": i,
+                "status": "finished" if i <= n // 2 else "not-started",
+                "start": weekend_start.isoformat() + "+00:00",
+                "end": (weekend_start + timedelta(days=2)).isoformat() + "+00:00",
+                "races": races,
+                "weather": {"temperature": rng.randint(10, 35), "condition": rng.choice(["sunny", "rain"])},
+            }
+        )
+    return ret
+
+
+def payloads(n_riders=25, n_events=20, seasons=1, n_teams=12, n_constructors=6, seed=0) -> dict[str, list[dict]]:
+    """Every feed of the fantasy website, keyed by file name, with ``n_events`` events for each of ``seasons``"""
+    events = n_events * seasons
+    return {
+        "riders.json": riders(n=n_riders, events=events, teams=n_teams, constructors=n_constructors, seed=seed),
+        "squads.json": squads(n=n_teams, events=events, seed=seed + 1),
+        "constructors.json": constructors(n=n_constructors, events=events, seed=seed + 2),
+        "events.json": weekends(n=events, seed=seed + 3),
+    }
@@ -1,7 +1,9 @@
 import streamlit as st
 from common.resources import logo
+from warmup import prewarm_in_background
 
 st.set_page_config(layout="wide")
+prewarm_in_background()
 
 logo()
 
@@ -0,0 +1,212 @@
+"""Read-only HTTP API serving the views of the shared FantasyStats as JSON or Parquet (run: python api.py --help)
+
+    GET /                                   available views
+    GET /riders/stats?columns=Rider,Cost $M only the given columns
+    GET /riders/history?Event Num=1,2       rows whose column matches one of the values
+    GET /weekends/events?limit=10&offset=20 a window of rows
+    GET /rider_full_data?format=parquet     Parquet instead of JSON records
+    GET /riders/42                          one rider as archived
+
+Responses carry an ETag derived from the snapshots they were built from and the query, so clients revalidating
+with If-None-Match get a 304 without anything being rebuilt or serialized.
+"""
+
+import argparse
+import io
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from hashlib import sha1
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from export import VIEWS
+
+# Serialized responses kept in memory, shared by every client
+BODY_CACHE_SIZE = 64
+# Query parameters that are not column filters
+RESERVED = {"columns", "format", "limit", "offset"}
+CONTENT_TYPES = {"json": "application/json", "parquet": "application/vnd.apache.parquet"}
+# One entity of a snapshot by id, e.g. /riders/42
+ENTITY = re.compile(r"^/(riders|constructors|teams|weekends)/(\d+)$")
+
+_log = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Bodies:
+    """Least recently used serialized responses keyed by ETag, each built once however many clients ask at once"""
+
+    def __init__(self, size: int = BODY_CACHE_SIZE):
+        self.size = size
+        self._bodies: OrderedDict[str, bytes] = OrderedDict()
+        self._building: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, build) -> bytes:
+        with self._lock:
+            building = self._building.setdefault(etag, threading.Lock())
+        with building:
+            with self._lock:
+                if etag in self._bodies:
+                    self._bodies.move_to_end(etag)
+                    return self._bodies[etag]
+            try:
+                body = build()
+                with self._lock:
+                    self._bodies[etag] = body
+                    while len(self._bodies) > self.size:
+                        self._bodies.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._building.pop(etag, None)
+            return body
+
+
+def routes() -> dict[str, tuple[str, str]]:
+    """URL path -> (FantasyStats attribute, view)"""
+    return {
+        f"/{entity}/{view}" if entity else f"/{view}": (entity, view)
+        for entity, views in VIEWS.items()
+        for view in views
+    }
+
+
+def select(df, query: dict[str, list[str]]):
+    """Apply column filters, the row window and the column projection of ``query`` to ``df``"""
+    df = df.reset_index()
+    for column, values in query.items():
+        if column in RESERVED:
+            continue
+        if column not in df.columns:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown column {column!r}")
+        wanted = [value for raw in values for value in raw.split(",")]
+        df = df[df[column].astype(str).isin(wanted)]
+    try:
+        offset = int(query.get("offset", ["0"])[-1])
+        limit = int(query["limit"][-1]) if "limit" in query else None
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "offset and limit must be integers")
+    df = df.iloc[offset : None if limit is None else offset + limit]
+    if "columns" in query:
+        columns = [column for raw in query["columns"] for column in raw.split(",")]
+        unknown = [column for column in columns if column not in df.columns]
+        if unknown:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown columns {unknown}")
+        df = df[columns]
+    return df
+
+
+def lookup(stats, attr: str, entity_id: str) -> dict:
+    """One archived entity as served by the website"""
+    try:
+        return getattr(stats, attr).served.entity(int(entity_id))
+    except KeyError:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No {attr} with id {entity_id}")
+
+
+def serialize(df, fmt: str) -> bytes:
+    if fmt == "parquet":
+        buffer = io.BytesIO()
+        df.reset_index(drop=True).to_parquet(buffer)
+        return buffer.getvalue()
+    return df.to_json(orient="records", date_format="iso").encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "FantasyMotoGPExplorer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        _log.debug(format % args)
+
+    def send(self, status: HTTPStatus, body: bytes = b"", content_type: str = "application/json", etag: str = None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        try:
+            self.handle_get()
+        except ApiError as exc:
+            self.send(exc.status, json.dumps({"error": str(exc)}).encode())
+        except Exception as exc:
+            _log.exception(f"Failed to serve {self.path}")
+            self.send(HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({"error": repr(exc)}).encode())
+
+    def handle_get(self):
+        url = urlsplit(self.path)
+        path = unquote(url.path).rstrip("/") or "/"
+        if path == "/":
+            self.send(HTTPStatus.OK, json.dumps(sorted(routes())).encode())
+            return
+        match = ENTITY.match(path)
+        if path not in routes() and not match:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No view at {path}")
+        query = parse_qs(url.query, keep_blank_values=True)
+        fmt = query.get("format", ["json"])[-1]
+        if fmt not in CONTENT_TYPES:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"format must be one of {sorted(CONTENT_TYPES)}")
+        stats = self.server.stats()
+        versions = "|".join(entity.data_version for entity in stats.entities)
+        etag = '"' + sha1(f"{versions}|{path}|{sorted(query.items())}".encode()).hexdigest() + '"'
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send(HTTPStatus.NOT_MODIFIED, etag=etag)
+            return
+
+        def build() -> bytes:
+            if match:
+                return json.dumps(lookup(stats, *match.groups())).encode()
+            attr, view = routes()[path]
+            source = getattr(stats, attr) if attr else stats
+            return serialize(select(getattr(source, view), query), fmt)
+
+        content_type = CONTENT_TYPES["json" if match else fmt]
+        self.send(HTTPStatus.OK, self.server.bodies.get(etag, build), content_type, etag)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """One thread per connection, all reading the same FantasyStats and response cache"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], stats=None):
+        super().__init__(address, Handler)
+        self._stats = stats
+        self.bodies = Bodies()
+
+    def stats(self):
+        if self._stats is not None:
+            return self._stats
+        from fantasy import shared_stats
+
+        return shared_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+    server = ApiServer((args.host, args.port))
+    _log.info(f"Serving on http://{args.host}:{server.server_port}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
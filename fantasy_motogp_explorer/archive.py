@@ -0,0 +1,289 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from hashlib import sha256
+
+import blocks
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_LEGACY = re.compile(r"^(\d{8})\.json$")
+_LEGACY_BLOB = re.compile(r"^([0-9a-f]{64})\.json\.gz$")
+# Bytes read or written at a time when streaming payloads
+CHUNK = 1 << 16
+
+
+def write_atomic(path: str, content: bytes):
+    """Write ``content`` to a temporary file next to ``path`` and rename it into place"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def iter_array(f, chunk: int = CHUNK) -> Iterator:
+    """Decode the items of the JSON array in the text file ``f`` one at a time, reading ``chunk`` characters at once.
+
+    Only the item being decoded and the text after it are held in memory, never the whole array.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    def more() -> bool:
+        nonlocal buffer, pos, eof
+        text = f.read(chunk)
+        eof = not text
+        buffer, pos = buffer[pos:] + text, 0
+        return not eof
+
+    def skip():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buffer) or not more():
+                return
+
+    skip()
+    if buffer[pos : pos + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    skip()
+    if buffer[pos : pos + 1] == "]":
+        return
+    while True:
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more()
+            continue
+        # A number reaching the end of the buffer may continue in the next chunk
+        if not eof and isinstance(item, (int, float)) and buffer[end : end + 1] in "0123456789+-.eE":
+            more()
+            continue
+        yield item
+        pos = end
+        skip()
+        if buffer[pos : pos + 1] == "]":
+            return
+        if buffer[pos : pos + 1] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+        pos += 1
+        skip()
+
+
+class FileLock:
+    """Exclusive lock on ``path`` held across threads and processes, released by the OS if the holder dies"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Archive:
+    """Every daily snapshot of one feed, with each distinct payload stored once as compressed blocks.
+
+    ``index.json`` maps each date (YYYYMMDD) to the sha256 of that day's payload, and each payload hash to the
+    validators (ETag/Last-Modified) it was served with, and each date to when it was last fetched. Payloads live
+    in ``blobs/<sha256>.blocks`` (see ``blocks``). Writers hold ``lock()`` so concurrent processes never lose index
+    updates.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.blobs = os.path.join(directory, "blobs")
+        self.index_path = os.path.join(directory, "index.json")
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path, "r") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return {"dates": {}, "validators": {}, "fetched": {}}
+
+    def lock(self) -> FileLock:
+        return FileLock(os.path.join(self.directory, ".lock"))
+
+    def index(self) -> dict[str, str]:
+        return self._read_index()["dates"]
+
+    def dates(self, start: str | None = None, end: str | None = None) -> list[str]:
+        return sorted(date for date in self.index() if (start or date) <= date <= (end or date))
+
+    def validators(self, sha: str) -> dict:
+        return self._read_index()["validators"].get(sha, {})
+
+    def fetched(self, date: str) -> float:
+        """Epoch seconds when ``date`` was last fetched from the website, 0 if never"""
+        return self._read_index().get("fetched", {}).get(date, 0.0)
+
+    def blob_path(self, sha: str) -> str:
+        return os.path.join(self.blobs, f"{sha}.blocks")
+
+    def _write_blob(self, sha: str, items: Iterable[dict]):
+        fd, tmp = tempfile.mkstemp(dir=self.blobs, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                blocks.write(f, items)
+            os.replace(tmp, self.blob_path(sha))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def store(self, chunks: Iterable[bytes]) -> str:
+        """Archive a JSON array payload as its ``chunks`` arrive and return the sha256 of its bytes.
+
+        The payload is spooled to disk and converted to blocks one entity at a time, so it is never held in memory
+        whole. Callers must hold ``lock()`` and then ``add`` the returned sha.
+        """
+        os.makedirs(self.blobs, exist_ok=True)
+        digest = sha256()
+        fd, spool = tempfile.mkstemp(dir=self.blobs, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+            sha = digest.hexdigest()
+            if not os.path.exists(self.blob_path(sha)):
+                with open(spool, "r", encoding="utf-8") as f:
+                    self._write_blob(sha, iter_array(f))
+        finally:
+            os.remove(spool)
+        return sha
+
+    def add(
+        self,
+        date: str,
+        content: bytes | None = None,
+        sha: str | None = None,
+        validators: dict | None = None,
+        fetched: float | None = None,
+    ):
+        """Record ``date`` as serving ``content``, or the already archived payload ``sha`` when no content is given.
+
+        Callers must hold ``lock()``.
+        """
+        if content is not None:
+            sha = self.store([content])
+        elif not os.path.exists(self.blob_path(sha)):
+            raise FileNotFoundError(self.blob_path(sha))
+        index = self._read_index()
+        index["dates"][date] = sha
+        if validators:
+            index["validators"][sha] = validators
+        if fetched:
+            index.setdefault("fetched", {})[date] = fetched
+        write_atomic(self.index_path, json.dumps(index, sort_keys=True).encode())
+        return sha
+
+    def load(self, date: str) -> list:
+        return list(self.items(self.index()[date]))
+
+    def items(self, sha: str) -> Iterator[dict]:
+        """Entities of the payload ``sha`` in payload order, each decoded only when reached"""
+        return iter(blocks.open_blocks(self.blob_path(sha)))
+
+    def entity(self, sha: str, entity_id) -> dict:
+        """The entity with id ``entity_id`` of the payload ``sha``; KeyError if there is none"""
+        return blocks.open_blocks(self.blob_path(sha)).get(entity_id)
+
+    def load_range(self, start: str | None = None, end: str | None = None) -> dict:
+        """Payloads of every archived date in [start, end], decoding each distinct payload only once"""
+        index = self.index()
+        decoded = {}
+        ret = {}
+        for date in self.dates(start, end):
+            sha = index[date]
+            if sha not in decoded:
+                decoded[sha] = list(self.items(sha))
+            ret[date] = decoded[sha]
+        return ret
+
+    def _legacy_blobs(self) -> list[str]:
+        return sorted(filter(_LEGACY_BLOB.match, os.listdir(self.blobs))) if os.path.isdir(self.blobs) else []
+
+    def import_legacy(self) -> list[str]:
+        """Bring snapshots stored by earlier versions into the archive.
+
+        Plain ``YYYYMMDD.json`` snapshots (and their ``.meta.json`` sidecars) are moved in, and gzipped
+        ``blobs/<sha256>.json.gz`` payloads are converted to blocks under the same hash.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        if not any(map(_LEGACY.match, os.listdir(self.directory))) and not self._legacy_blobs():
+            return []
+        with self.lock():
+            return self._import_legacy()
+
+    def _import_legacy(self) -> list[str]:
+        for filename in self._legacy_blobs():
+            path = os.path.join(self.blobs, filename)
+            sha = _LEGACY_BLOB.match(filename).group(1)
+            if not os.path.exists(self.blob_path(sha)):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    self._write_blob(sha, iter_array(f))
+            os.remove(path)
+        imported = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = _LEGACY.match(filename)
+            if not match:
+                continue
+            path = os.path.join(self.directory, filename)
+            meta_path = path.removesuffix(".json") + ".meta.json"
+            with open(path, "rb") as f:
+                content = f.read()
+            validators = {}
+            if os.path.exists(meta_path):
+                with open(meta_path, "r") as f:
+                    meta = json.loads(f.read())
+                validators = {k: meta[k] for k in ("etag", "last_modified") if meta.get(k)}
+            self.add(match.group(1), content, validators=validators)
+            os.remove(path)
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            imported.append(match.group(1))
+        return imported
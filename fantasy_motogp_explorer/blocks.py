@@ -0,0 +1,96 @@
+"""Snapshot payloads stored as one compressed block per entity, looked up by entity id through a memory map.
+
+A blocks file holds ``MAGIC``, a zlib dictionary taken from the first entities of the payload (itself compressed),
+the entities in payload order as compact JSON each compressed on its own against that dictionary, the index as JSON
+(``{"ids": [...], "offsets": [...], "dictionary": [start, end]}``) and finally the offset of the index as an
+8-byte little-endian integer. Entities share most of their keys and structure, so the dictionary keeps the file
+about as small as gzipping the whole payload while any entity decodes without touching the others.
+"""
+
+import functools
+import itertools
+import json
+import mmap
+import zlib
+from collections.abc import Iterable, Iterator
+
+MAGIC = b"FMGPBLK1"
+LEVEL = 9
+# Bytes of the first entities used as the dictionary every block is compressed against
+DICTIONARY_SIZE = 16 * 1024
+# Blocks files kept open (and mapped) at once
+OPEN_FILES = 32
+
+
+def _encode(item: dict) -> tuple:
+    return item["id"], json.dumps(item, separators=(",", ":")).encode()
+
+
+def write(f, items: Iterable[dict]):
+    """Write the entities ``items`` (dicts with an ``id``) to the binary file ``f`` as blocks.
+
+    Only the entities making up the dictionary are held in memory at once.
+    """
+    items = iter(items)
+    head, size = [], 0
+    for item in items:
+        head.append(_encode(item))
+        size += len(head[-1][1])
+        if size >= DICTIONARY_SIZE:
+            break
+    dictionary = b"".join(encoded for _, encoded in head)[:DICTIONARY_SIZE]
+    packed = zlib.compress(dictionary, LEVEL)
+    f.write(MAGIC + packed)
+    offset = len(MAGIC) + len(packed)
+    index = {"ids": [], "offsets": [], "dictionary": [len(MAGIC), offset]}
+    for entity_id, encoded in itertools.chain(head, map(_encode, items)):
+        compressor = zlib.compressobj(LEVEL, zdict=dictionary) if dictionary else zlib.compressobj(LEVEL)
+        block = compressor.compress(encoded) + compressor.flush()
+        f.write(block)
+        index["ids"].append(entity_id)
+        index["offsets"].append(offset)
+        offset += len(block)
+    index["offsets"].append(offset)
+    f.write(json.dumps(index, separators=(",", ":")).encode())
+    f.write(offset.to_bytes(8, "little"))
+
+
+class Blocks:
+    """Read-only, memory-mapped view of a blocks file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a blocks file")
+        start = int.from_bytes(self._map[-8:], "little")
+        index = json.loads(self._map[start:-8])
+        self.ids = index["ids"]
+        self._offsets = index["offsets"]
+        self._positions = {entity_id: position for position, entity_id in enumerate(self.ids)}
+        self._dictionary = zlib.decompress(self._map[slice(*index["dictionary"])])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, entity_id) -> bool:
+        return entity_id in self._positions
+
+    def __iter__(self) -> Iterator[dict]:
+        return map(self._decode, range(len(self.ids)))
+
+    def _decode(self, position: int) -> dict:
+        block = self._map[self._offsets[position] : self._offsets[position + 1]]
+        decompressor = zlib.decompressobj(zdict=self._dictionary) if self._dictionary else zlib.decompressobj()
+        return json.loads(decompressor.decompress(block) + decompressor.flush())
+
+    def get(self, entity_id) -> dict:
+        """The entity with id ``entity_id``; KeyError if the payload has none"""
+        return self._decode(self._positions[entity_id])
+
+
+@functools.lru_cache(maxsize=OPEN_FILES)
+def open_blocks(path: str) -> Blocks:
+    """Shared Blocks of ``path``; blocks files are named by content hash and never change once written"""
+    return Blocks(path)
@@ -0,0 +1,19 @@
+import json
+
+import streamlit as st
+from spans import SPANS
+
+
+def debug_panel():
+    """Optional sidebar showing how long each pipeline stage took in this server process"""
+    with st.sidebar:
+        if not st.toggle("Performance", key="debug_panel", help="Per-stage timings (ms) of this server process"):
+            return
+        summary = SPANS.summary()
+        st.dataframe(summary, hide_index=True, use_container_width=True)
+        st.download_button(
+            "Export spans",
+            "\n".join(json.dumps(record, default=str) for record in SPANS.export()),
+            file_name="spans.jsonl",
+            mime="application/jsonl",
+        )
@@ -0,0 +1,75 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from spans import span
+from st_aggrid import AgGrid, GridOptionsBuilder
+
+# Frames with more rows than this are sorted, filtered and paged on the server, one page at a time
+PAGE_SIZE = 500
+
+# Arguments named with a leading underscore are not hashed by streamlit's caches: frames are identified by
+# (key, version, columns) instead, where version is the data version of the snapshot the frame was built from.
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _options(_frame: pd.DataFrame, key: str, version: str, columns: tuple, column_width: int | None, paged: bool):
+    # Sorting or filtering in the browser would only apply to the page it has
+    defaults = {"sortable": False, "filter": False} if paged else {}
+    gb = GridOptionsBuilder.from_dataframe(
+        _frame.iloc[:0], resizable=True, wrapHeaderText=True, autoHeaderHeight=True, **defaults
+    )
+    gb.configure_side_bar()
+    gb.configure_first_column_as_index(resizable=True)
+    options = gb.build()
+    if column_width is not None:
+        for col_def in options["columnDefs"]:
+            name = col_def["field"]
+            col_def["width"] = min(95, column_width + max([len(x) * 7 for x in name.split(" ")]))
+    return options
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _order(_frame: pd.DataFrame, key: str, version: str, columns: tuple, column: str, ascending: bool) -> np.ndarray:
+    values = _frame[column].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _haystack(_frame: pd.DataFrame, key: str, version: str, columns: tuple) -> pd.Series:
+    text = [_frame[column].astype(str).str.lower() for column in _frame.columns]
+    return functools.reduce(lambda left, right: left + "\x00" + right, text).reset_index(drop=True)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _matches(_frame: pd.DataFrame, key: str, version: str, columns: tuple, text: str) -> np.ndarray:
+    return _haystack(_frame, key, version, columns).str.contains(text.lower(), regex=False).to_numpy()
+
+
+def grid(frame: pd.DataFrame, key: str, version: str, column_width: int | None = 40, page_size: int = PAGE_SIZE):
+    """Show ``frame`` in an AgGrid, sending at most ``page_size`` rows to the browser.
+
+    Grid options are cached per frame ``version``. Small frames are sorted and filtered in the browser; larger
+    ones get a filter box, sort column and page selector above the grid, and sort orders and filter matches are
+    cached on the server per version, so a rerun only slices out the requested page.
+    """
+    columns = tuple(map(str, frame.columns))
+    paged = len(frame) > page_size
+    rows = frame
+    if paged:
+        c_filter, c_sort, c_order, c_page = st.columns([4, 3, 1, 1])
+        text = c_filter.text_input("Filter", key=f"{key}_filter", placeholder="Search all columns")
+        column = c_sort.selectbox("Sort by", ("",) + columns, key=f"{key}_sort")
+        ascending = c_order.toggle("Ascending", True, key=f"{key}_ascending")
+        positions = _order(frame, key, version, columns, column, ascending) if column else np.arange(len(frame))
+        if text:
+            positions = positions[_matches(frame, key, version, columns, text)[positions]]
+        pages = max(1, -(-len(positions) // page_size))
+        st.session_state[f"{key}_page"] = min(st.session_state.get(f"{key}_page", 1), pages)
+        page = c_page.number_input(f"Page of {pages}", min_value=1, max_value=pages, key=f"{key}_page")
+        rows = frame.iloc[positions[(page - 1) * page_size : page * page_size]]
+        st.caption(f"{len(positions)} of {len(frame)} rows")
+    options = _options(frame, key, version, columns, column_width, paged)
+    with span("render", grid=key, rows=len(rows)):
+        return AgGrid(rows, options, key=key, fit_columns_on_grid_load=True, update_on=["stateChanged"])
@@ -1,7 +1,21 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import cache
 
 
-@dataclass(kw_only=True)
+@cache
+def init_fields(cls) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.init)
+
+
+class FromDict:
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, env: dict):
+        return cls(**{k: env.get(k) for k in init_fields(cls)})
+
+
+@dataclass(kw_only=True, slots=True)
 class EventStats:
     event_num: int
     points: float
@@ -1,7 +1,6 @@
-import inspect
 from dataclasses import dataclass, field
 
-from data_models.common import Stats
+from data_models.common import FromDict, Stats
 
 
 @dataclass(kw_only=True)
@@ -10,7 +9,7 @@ class ConstructorStats(Stats):
 
 
 @dataclass
-class Constructor:
+class Constructor(FromDict):
     id: int
     name: str
     num_riders: int
@@ -19,12 +18,6 @@ class Constructor:
     _stats: ConstructorStats = field(init=False, repr=False)
     _cost_millions: int = field(init=False, repr=False)
 
-    @classmethod
-    def from_dict(cls, env):
-        default_env = {k: None for k in inspect.signature(cls).parameters}
-        default_env.update(env)
-        return cls(**{k: v for k, v in default_env.items() if k in inspect.signature(cls).parameters})
-
     @property
     def stats(self):
         return self._stats
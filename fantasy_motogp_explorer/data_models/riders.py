@@ -1,8 +1,9 @@
-import inspect
 from dataclasses import dataclass, field
 
+from data_models.common import FromDict
 
-@dataclass
+
+@dataclass(slots=True)
 class RiderEventStats:
     grid_position: int
     q1_position: int
@@ -31,7 +32,7 @@ class RiderEventStats:
 
 
 @dataclass
-class RiderStats:
+class RiderStats(FromDict):
     wpr_history: dict
     avg_points: float
     podium: int
@@ -51,12 +52,6 @@ class RiderStats:
     _prices: list[int] = field(init=False, repr=False)
     _events: list[RiderEventStats] = field(init=False, repr=False)
 
-    @classmethod
-    def from_dict(cls, env):
-        default_env = {k: None for k in inspect.signature(cls).parameters}
-        default_env.update(env)
-        return cls(**{k: v for k, v in default_env.items() if k in inspect.signature(cls).parameters})
-
     @property
     def prices(self):
         return self._prices
@@ -91,7 +86,7 @@ class RiderStats:
 
 
 @dataclass
-class _Rider:
+class _Rider(FromDict):
     first_name: str
     last_name: str
     country: str
@@ -107,12 +102,6 @@ class _Rider:
     rider: str = field(init=False)
     _cost_millions: int = field(init=False)
 
-    @classmethod
-    def from_dict(cls, env):
-        default_env = {k: None for k in inspect.signature(cls).parameters}
-        default_env.update(env)
-        return cls(**{k: v for k, v in default_env.items() if k in inspect.signature(cls).parameters})
-
     @property
     def stats(self):
         return self._stats
@@ -0,0 +1,72 @@
+from dataclasses import fields
+from datetime import datetime
+from functools import cache
+from typing import get_type_hints
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = frozenset({"status", "country", "type"})
+_INTEGERS = ("Int8", "Int16", "Int32", "Int64")
+
+
+def _category(col: pd.Series) -> pd.Series:
+    return col.astype("category")
+
+
+def _datetime(col: pd.Series) -> pd.Series:
+    return pd.to_datetime(col, utc=True)
+
+
+def _numeric(col: pd.Series) -> pd.Series | None:
+    """``col`` as numbers, or None if any value is not a number, so one odd value in a feed never fails a frame"""
+    numeric = pd.to_numeric(col, errors="coerce")
+    return None if (numeric.isna() & col.notna()).any() else numeric
+
+
+def _integer(col: pd.Series) -> pd.Series:
+    numeric = _numeric(col)
+    if numeric is None:
+        return col
+    col = numeric
+    if not (col.dropna() % 1 == 0).all():
+        return col
+    low, high = col.min(), col.max()
+    for dtype in _INTEGERS:
+        bounds = np.iinfo(dtype.lower())
+        if pd.isna(low) or (bounds.min <= low and high <= bounds.max):
+            return col.astype(dtype)
+    return col
+
+
+def _float(col: pd.Series) -> pd.Series:
+    numeric = _numeric(col)
+    if numeric is None:
+        return col
+    col = numeric
+    downcast = col.astype(np.float32)
+    # Costs and points are shown as-is, so only downcast when float32 holds every value exactly
+    return downcast if np.array_equal(downcast.to_numpy(np.float64), col.to_numpy(np.float64), equal_nan=True) else col
+
+
+@cache
+def frame_schema(cls) -> dict:
+    """Column converters for a frame built from instances of the dataclass ``cls``, derived from its annotations"""
+    hints = get_type_hints(cls)
+    schema = {}
+    for f in fields(cls):
+        hint = hints[f.name]
+        if f.name in CATEGORIES:
+            schema[f.name] = _category
+        elif hint is datetime:
+            schema[f.name] = _datetime
+        elif hint is int:
+            schema[f.name] = _integer
+        elif hint is float:
+            schema[f.name] = _float
+    return schema
+
+
+def apply_schema(df: pd.DataFrame, cls) -> pd.DataFrame:
+    schema = frame_schema(cls)
+    return df.assign(**{col: convert(df[col]) for col, convert in schema.items() if col in df})
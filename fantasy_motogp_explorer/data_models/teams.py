@@ -1,7 +1,6 @@
-import inspect
 from dataclasses import dataclass, field
 
-from data_models.common import Stats
+from data_models.common import FromDict, Stats
 
 
 @dataclass(kw_only=True)
@@ -10,23 +9,17 @@ class TeamStats(Stats):
 
 
 @dataclass
-class Team:
+class Team(FromDict):
     id: int
     name: str
     num_riders: int
-    is_wildcard: int
+    is_wildcard: bool
     cost: float
     stats: TeamStats
     _is_wildcard: bool = field(init=False, repr=False)
     _stats: TeamStats = field(init=False, repr=False)
     _cost_millions: int = field(init=False, repr=False)
 
-    @classmethod
-    def from_dict(cls, env):
-        default_env = {k: None for k in inspect.signature(cls).parameters}
-        default_env.update(env)
-        return cls(**{k: v for k, v in default_env.items() if k in inspect.signature(cls).parameters})
-
     @property
     def is_wildcard(self):
         return self._is_wildcard
@@ -1,44 +1,25 @@
-import inspect
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from data_models.common import FromDict
 
-@dataclass
-class Event:
+
+@dataclass(slots=True)
+class Event(FromDict):
     id: int
     type: str
     status: str
     is_race2: int
     start: datetime
     end: datetime
-    _start: datetime = field(init=False, repr=False)
-    _end: datetime = field(init=False, repr=False)
 
-    @classmethod
-    def from_dict(cls, env):
-        default_env = {k: None for k in inspect.signature(cls).parameters}
-        default_env.update(env)
-        return cls(**{k: v for k, v in default_env.items() if k in inspect.signature(cls).parameters})
-
-    @property
-    def start(self):
-        return self._start
-
-    @start.setter
-    def start(self, start):
-        self._start = datetime.fromisoformat(start)
-
-    @property
-    def end(self):
-        return self._end
-
-    @end.setter
-    def end(self, end):
-        self._end = datetime.fromisoformat(end)
+    def __post_init__(self):
+        self.start = datetime.fromisoformat(self.start)
+        self.end = datetime.fromisoformat(self.end)
 
 
 @dataclass
-class Weekend:
+class Weekend(FromDict):
     id: int
     name: str
     circuit: str
@@ -54,12 +35,6 @@ class Weekend:
     _end: datetime = field(init=False, repr=False)
     _races: list[Event] = field(init=False, repr=False)
 
-    @classmethod
-    def from_dict(cls, env):
-        default_env = {k: None for k in inspect.signature(cls).parameters}
-        default_env.update(env)
-        return cls(**{k: v for k, v in default_env.items() if k in inspect.signature(cls).parameters})
-
     @property
     def start(self):
         return self._start
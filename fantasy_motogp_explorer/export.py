@@ -0,0 +1,96 @@
+"""Write every view of archived days to Parquet files (run: python export.py --help)"""
+
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from archive import Archive
+from snapshots import DATA_DIR
+
+# Views exported per FantasyStats attribute; "" is FantasyStats itself
+VIEWS = {
+    "riders": ("info", "stats", "history", "all_data"),
+    "constructors": ("info", "stats", "history", "all_data"),
+    "teams": ("info", "stats", "history", "all_data"),
+    "weekends": ("info", "events", "all_data"),
+    "": ("rider_full_data",),
+}
+# Archive directory of every entity
+ENTITIES = ("rider", "constructor", "team", "weekend")
+
+_log = logging.getLogger(__name__)
+
+
+def _archive(data_dir: str, name: str) -> Archive:
+    archive = Archive(os.path.join(data_dir, name))
+    # Installs that never served a snapshot since the archive was introduced still hold plain YYYYMMDD.json days
+    archive.import_legacy()
+    return archive
+
+
+def archived_dates(data_dir: str = DATA_DIR, start: str | None = None, end: str | None = None) -> list[str]:
+    """Days in [start, end] archived for every entity, so exporting them never needs the website"""
+    dates = [set(_archive(data_dir, name).dates(start, end)) for name in ENTITIES]
+    return sorted(set.intersection(*dates))
+
+
+def export_day(date: str, out_dir: str, data_dir: str = DATA_DIR) -> dict[str, str]:
+    """Write ``<out_dir>/<date>/<entity>.<view>.parquet`` for every view, returning each view's path or error"""
+    from fantasy import FantasyStats
+
+    stats = FantasyStats(version=date, data_dir=data_dir)
+    directory = os.path.join(out_dir, date)
+    os.makedirs(directory, exist_ok=True)
+    ret = {}
+    for entity, views in VIEWS.items():
+        source = getattr(stats, entity) if entity else stats
+        for view in views:
+            name = f"{entity}.{view}" if entity else view
+            path = os.path.join(directory, f"{name}.parquet")
+            try:
+                getattr(source, view).to_parquet(path)
+            except Exception as exc:
+                _log.warning(f"Not exporting {name} of {date}: {exc!r}")
+                ret[name] = f"error: {exc!r}"
+                continue
+            ret[name] = path
+    return ret
+
+
+def export(dates: list[str], out_dir: str, data_dir: str = DATA_DIR, processes: int | None = None) -> dict[str, dict]:
+    """Export ``dates`` in parallel worker processes, one day per task"""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = pool.map(export_day, dates, [out_dir] * len(dates), [data_dir] * len(dates))
+        return dict(zip(dates, results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("out_dir", help="directory to write <date>/<entity>.<view>.parquet files to")
+    parser.add_argument("--dates", nargs="+", metavar="YYYYMMDD", help="days to export (default: all archived)")
+    parser.add_argument("--start", metavar="YYYYMMDD", help="first archived day to export")
+    parser.add_argument("--end", metavar="YYYYMMDD", help="last archived day to export")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    available = archived_dates(args.data_dir, args.start, args.end)
+    dates = [date for date in args.dates if date in available] if args.dates else available
+    for date in sorted(set(args.dates or []) - set(dates)):
+        _log.warning(f"Skipping {date}: not archived for every entity")
+    if not dates:
+        parser.exit(1, "Nothing to export\n")
+    results = export(dates, args.out_dir, args.data_dir, args.processes)
+    failed = 0
+    for date, paths in results.items():
+        errors = [name for name, path in paths.items() if path.startswith("error")]
+        failed += len(errors)
+        failures = f", failed: {', '.join(errors)}" if errors else ""
+        sys.stdout.write(f"{date}: {len(paths) - len(errors)} views written{failures}\n")
+    parser.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
@@ -1,6 +1,11 @@
-import json
 import logging
 import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
 from datetime import datetime
 from functools import cached_property
 
@@ -8,71 +13,213 @@ import pandas as pd
 import requests
 from data_models.constructors import Constructor
 from data_models.riders import Rider
+from data_models.schema import apply_schema
 from data_models.teams import Team
 from data_models.weekends import Weekend
+from frames import FrameCache, cached_frame
+from history import stack_events
+from projections import project
+from scheduler import Calendar, RefreshScheduler
+from snapshots import DATA_DIR, TIMEOUT, Snapshot, pooled_session
+from spans import timed
+from star import Star
+from store import EventStore, HistoryStore
+from timeseries import TimeSeries
+from urls import base_url as _base_url
+from urls import constructors_path
 from urls import constructors_url as _constructors
+from urls import events_path
 from urls import events_url as _events
+from urls import riders_path
 from urls import riders_url as _riders
+from urls import squads_path
 from urls import squads_url as _squads
+from views import drop, locked_cached_property, view, view_stats
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
 )
 
+SHARED_TTL = 60 * 60
+# Attempts, and the first wait in seconds (doubled after every failure), when revalidating a snapshot
+RETRIES = 4
+BACKOFF = 2.0
+# Fields of the stats of riders, constructors and teams that are not kept in their info frames
+PER_EVENT = ("prices", "_prices", "events", "_events")
+
+
+def snapshot_key(now: datetime | None = None) -> str:
+    return datetime.strftime(now or datetime.now(), "%Y%m%d")
+
+
+def _retryable(exc: requests.RequestException) -> bool:
+    """Whether a failed request may succeed later: a dropped or timed out connection, or a 429 or 5xx response"""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)):
+        return True
+    response = exc.response
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
+
 
 class Base:
+    # Column numbering each entity's events in the stacked events frame, if any
+    _event_position: str | None = None
+
     def __init__(
         self,
         url: str,
         name: str,
         base_class: type,
+        version: str | None = None,
+        data_dir: str = DATA_DIR,
     ):
         self._url = url
         self._name = name
         self._base_class = base_class
+        self._version = version or snapshot_key()
+        self._data_dir = data_dir
+        self._revalidate_lock = threading.Lock()
+        self._revalidation: threading.Thread | None = None
 
     @cached_property
     def _log(self):
         return logging.getLogger(":".join([__name__, self._name]))
 
     @cached_property
-    def website_json(self):
-        datestr = datetime.strftime(datetime.now(), "%Y%m%d")
-        directory = os.path.join(os.path.dirname(__file__), "data", self._name)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        filename = os.path.join(directory, f"{datestr}.json")
+    def snapshot(self):
+        return Snapshot(self._url, self._name, self._version, self._data_dir)
+
+    def refresh(self, session: requests.Session | None = None, timeout=TIMEOUT) -> bool:
+        self._log.info(f"Checking website for new {self._name+' '}stats")
+        changed = self.snapshot.refresh(session, timeout)
+        if changed:
+            # Replaced as a unit under the view lock, so no view pairs the new snapshot with the old parse or frames
+            drop(self, "served", "_parsed", "frames")
+        return changed
+
+    def revalidate(self, retries: int = RETRIES, backoff: float = BACKOFF) -> bool:
+        """Refresh, retrying requests that failed for transient reasons with jittered exponential backoff"""
+        for attempt in range(retries):
+            try:
+                return self.refresh()
+            except requests.RequestException as exc:
+                if attempt == retries - 1 or not _retryable(exc):
+                    raise
+                delay = backoff * 2**attempt * random.uniform(0.5, 1.5)
+                self._log.warning(f"Fetching {self._name+' '}stats failed ({exc}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _revalidate_quietly(self):
         try:
-            with open(filename, "r") as f:
-                data = json.loads(f.read())
-            self._log.info(f"Using {self._name+' '}data from disk: {filename}")
-        except FileNotFoundError:
+            self.revalidate()
+        except requests.RequestException as exc:
+            self._log.error(f"Giving up on fetching {self._name+' '}stats: {exc}")
+
+    def revalidate_in_background(self) -> threading.Thread:
+        """Start revalidating on a daemon thread, unless a revalidation is already running"""
+        with self._revalidate_lock:
+            if self._revalidation is None or not self._revalidation.is_alive():
+                self._revalidation = threading.Thread(
+                    target=self._revalidate_quietly, name=f"revalidate-{self._name}", daemon=True
+                )
+                self._revalidation.start()
+            return self._revalidation
+
+    @locked_cached_property
+    def served(self) -> Snapshot:
+        """Today's snapshot, or the latest archived one while today's is fetched in the background.
+
+        Only when nothing was ever archived does the caller wait for the website. The snapshot is pinned to the
+        payload it had when served, so refreshes by other threads or processes never change what it reads.
+        """
+        sha = self.snapshot.sha256
+        if sha:
+            return self.snapshot.at(sha)
+        stale = self.snapshot.previous()
+        if stale is None:
             self._log.info(f"Getting {self._name+' '}stats from website")
-            data = requests.get(self._url).json()
-            with open(filename, "w") as f:
-                f.write(json.dumps(data))
-        return data
+            self.revalidate()
+            return self.snapshot.at(self.snapshot.sha256)
+        self._log.info(f"Serving {self._name+' '}data of {stale.version} while today's is fetched")
+        self.revalidate_in_background()
+        return stale.at(stale.sha256)
 
-    @cached_property
-    def raw_info(self):
-        return [self._base_class.from_dict(datum) for datum in self.website_json]
+    @locked_cached_property
+    def frames(self):
+        served = self.served
+        return FrameCache(os.path.join(served.directory, "frames"), served.sha256)
 
-    @cached_property
-    def _info(self):
-        df = pd.DataFrame(self.raw_info).set_index("id")
-        for col in df:
-            if str(df[col].dtype) != "object":
-                continue
-            try:
-                df[col] = pd.to_datetime(df[col], utc=True, format="%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                pass
-        return df
+    @property
+    def data_version(self) -> str:
+        return self.frames.key
+
+    def entity(self, entity_id):
+        """The parsed entity with id ``entity_id`` of the served snapshot"""
+        return self._base_class.from_dict(self.served.entity(entity_id))
+
+    def _row(self, entity) -> dict:
+        """Values of the columns of ``_info`` for one parsed entity"""
+        return {f.name: getattr(entity, f.name) for f in fields(entity)}
+
+    def _events_of(self, entity) -> list:
+        """Event dataclasses of one parsed entity; none unless the entity has events"""
+        return []
+
+    @timed("parse")
+    def _parse(self) -> tuple[dict[str, list], list[list]]:
+        """Stream the served payload one entity at a time into lists of column values.
+
+        Neither the payload nor the parsed entities are kept, only their column values and events.
+        """
+        served = self.served
+        self._log.info(f"Using {self._name+' '}data from disk: {served.path}")
+        columns = defaultdict(list)
+        events = []
+        for datum in served.items():
+            entity = self._base_class.from_dict(datum)
+            for name, value in self._row(entity).items():
+                columns[name].append(value)
+            events.append(self._events_of(entity))
+        return columns, events
+
+    @timed("normalize")
+    def _normalize(self, columns: dict[str, list]) -> pd.DataFrame:
+        return apply_schema(pd.DataFrame(columns).set_index("id"), self._base_class)
+
+    @timed("stack")
+    def _stack(self, index: pd.Index, events: list[list]) -> pd.DataFrame:
+        return stack_events(index, events, position=self._event_position)
+
+    @locked_cached_property
+    def _parsed(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        # Only the frames are kept: the column lists and event dataclasses go out of scope here
+        columns, events = self._parse()
+        info = self._normalize(columns)
+        return info, self._stack(info.index, events)
+
+    @property
+    def _info(self) -> pd.DataFrame:
+        return self._parsed[0]
+
+    @property
+    def _events(self) -> pd.DataFrame:
+        """Events of every entity stacked by ``stack_events``"""
+        return self._parsed[1]
 
 
 class BaseStats(Base):
 
-    @property
+    def _row(self, entity) -> dict:
+        # Events are stacked into history and prices are not shown, so only the totals are kept per entity
+        row = super()._row(entity)
+        row["stats"] = {f.name: getattr(entity.stats, f.name) for f in fields(entity.stats) if f.name not in PER_EVENT}
+        row["_stats"] = None
+        return row
+
+    def _events_of(self, entity) -> list:
+        return entity.stats.events
+
+    @view("data_version")
+    @cached_frame
     def info(self):
         ret = self._info.drop(columns=["stats", "_stats", "_cost_millions"]).rename(
             errors="ignore",
@@ -90,13 +237,14 @@ class BaseStats(Base):
         )
         return ret
 
-    @property
+    @view("data_version")
     def _stats(self):
         df = pd.json_normalize(self._info.stats)
         df.index = self._info.index
         return df
 
-    @property
+    @view("info", "_stats")
+    @cached_frame
     def stats(self):
         identifier = "Rider" if "Rider" in self.info.columns else "Name"
         ret = (
@@ -111,41 +259,50 @@ class BaseStats(Base):
             .sort_values("Total Fantasy Points", ascending=False)
         )
 
-    @property
+    @view("data_version", "info")
+    @cached_frame
     def history(self):
-        df = pd.json_normalize(self._stats.events)
-        df.index = self._info.index
-        dfs = []
-        for event_id in df:
-            df_event = pd.json_normalize(df[event_id])
-            df_event.index = self._info.index
-            dfs.append(df_event)
-        df_events = pd.concat(dfs).sort_values("event_num")
+        df_events = self._events.copy(deep=False)
         identifier = "Rider" if "Rider" in self.info.columns else "Name"
         df_events.insert(0, identifier, self.info[identifier])
         df_events.columns = [x.replace("_", " ").title() for x in df_events.columns]
         return df_events
 
-    @property
+    @view("history")
+    def history_store(self) -> HistoryStore:
+        """``history`` indexed for lookups by entity and event number"""
+        return HistoryStore(self.history)
+
+    @cached_property
+    def timeseries(self):
+        return TimeSeries(self.snapshot.archive, os.path.join(self.snapshot.directory, "timeseries"))
+
+    @view("data_version")
+    def price_history(self):
+        """Cost and points of every entity on every archived day, indexed by (date, id)"""
+        self.timeseries.ingest()
+        return self.timeseries.frame(dense=True)
+
+    @view("info", "stats")
     def complete_info(self):
         complete = self.info.join(self.stats.drop(columns=["Rider", "Name", "Num riders"], errors="ignore"))
         return complete
 
-    @property
+    @view("info", "stats", "history")
     def all_data(self):
         all_data = (
             self.info.merge(self.stats, how="left", left_index=True, right_index=True).merge(
                 self.history, how="left", left_index=True, right_index=True
             )
-        ).sort_values("Event Num")
+        ).sort_values("Event Num", kind="stable")
         return all_data
 
 
 class RiderStats(BaseStats):
-    def __init__(self, url: str = _riders, name: str = "rider", base_class: type = Rider):
-        super().__init__(url=url, name=name, base_class=base_class)
+    def __init__(self, url: str = _riders, name: str = "rider", base_class: type = Rider, **kwargs):
+        super().__init__(url=url, name=name, base_class=base_class, **kwargs)
 
-    @property
+    @view("info")
     def basic_info(self):
         basic_data = (
             super().info.sort_values("Cost $M", ascending=False).drop(columns=["squad_id", "constructor_id", "team_id"])
@@ -155,19 +312,19 @@ class RiderStats(BaseStats):
 
 
 class ConstructorStats(BaseStats):
-    def __init__(self, url: str = _constructors, name: str = "constructor", base_class: type = Constructor):
-        super().__init__(url=url, name=name, base_class=base_class)
+    def __init__(self, url: str = _constructors, name: str = "constructor", base_class: type = Constructor, **kwargs):
+        super().__init__(url=url, name=name, base_class=base_class, **kwargs)
 
 
 class TeamStats(BaseStats):
-    def __init__(self, url: str = _squads, name: str = "team", base_class: type = Team):
-        super().__init__(url=url, name=name, base_class=base_class)
+    def __init__(self, url: str = _squads, name: str = "team", base_class: type = Team, **kwargs):
+        super().__init__(url=url, name=name, base_class=base_class, **kwargs)
 
-    @property
+    @view("data_version")
     def info(self):
         return super().info.drop(columns="_is_wildcard")
 
-    @property
+    @view("info")
     def basic_info(self):
         basic_data = self.info.sort_values("Cost $M", ascending=False).rename(
             columns={"num_riders": "Riders", "cost": "Cost ($M)", "is_wildcard": "wildcard"}
@@ -177,59 +334,190 @@ class TeamStats(BaseStats):
 
 
 class Weekends(Base):
-    def __init__(self, url: str = _events, name: str = "weekend", base_class: type = Weekend):
-        super().__init__(url=url, name=name, base_class=base_class)
+    _event_position = "weekend_event"
 
-    @property
+    def __init__(self, url: str = _events, name: str = "weekend", base_class: type = Weekend, **kwargs):
+        super().__init__(url=url, name=name, base_class=base_class, **kwargs)
+
+    def _row(self, entity) -> dict:
+        # Races are stacked into events, so the info frame does not keep a second copy of them
+        row = super()._row(entity)
+        del row["races"], row["_races"]
+        return row
+
+    def _events_of(self, entity) -> list:
+        return entity.races
+
+    @view("data_version")
+    @cached_frame
     def info(self):
-        df = self._info.drop(columns=["_start", "_end", "_races", "races", "weather"])
+        df = self._info.drop(columns=["_start", "_end", "weather"])
         df = df.rename(columns={"position": "number"})
         weather = pd.json_normalize(self._info.weather)
         weather.index = df.index
         return pd.concat([df, weather], axis=1)
 
-    @property
+    @view("data_version")
+    @cached_frame
     def events(self):
-        events = pd.json_normalize(self._info.races)
-        events.index = self._info.index
-        dfs = []
-        for event_order in events:
-            event = pd.json_normalize(events[event_order])
-            event["weekend_event"] = event_order + 1
-            event.index = events.index
-            dfs.append(event)
-        ret = pd.concat(dfs).drop(columns=["_start", "_end"])
-        return ret.rename(columns={"id": "event_id"}).sort_values("event_id")
+        return self._events.rename(columns={"id": "event_id"}).sort_values("event_id", kind="stable")
 
-    @property
+    @view("events")
+    def event_store(self) -> EventStore:
+        """``events`` indexed for lookups by weekend id and session type"""
+        return EventStore(self.events)
+
+    @view("info", "events")
     def all_data(self):
         return self.info.join(self.events, rsuffix="_of_event")
 
 
-# @st.cache_resource
 class FantasyStats:
+    def __init__(self, version: str | None = None, base_url: str = _base_url, data_dir: str = DATA_DIR):
+        self.version = version or snapshot_key()
+        self.created = time.monotonic()
+        self._base_url = base_url
+        self._data_dir = data_dir
+
+    def _entity_kwargs(self, path: str) -> dict:
+        return dict(url=self._base_url + path, version=self.version, data_dir=self._data_dir)
+
     @cached_property
     def riders(self):
-        return RiderStats()
+        return RiderStats(**self._entity_kwargs(riders_path))
 
     @cached_property
     def constructors(self):
-        return ConstructorStats()
+        return ConstructorStats(**self._entity_kwargs(constructors_path))
 
     @cached_property
     def teams(self):
-        return TeamStats()
+        return TeamStats(**self._entity_kwargs(squads_path))
 
     @cached_property
     def weekends(self):
-        return Weekends()
+        return Weekends(**self._entity_kwargs(events_path))
 
-    @cached_property
-    def rider_full_data(self):
-        constructor = self.constructors.info.rename(columns={"name": "constructor"})
-        team = self.teams.info.rename(columns={"name": "team"})
-        full_data = self.riders.all_data.merge(
-            constructor.constructor, left_on="constructor_id", right_index=True
-        ).merge(team.team, left_on="team_id", right_index=True)
-        ret = full_data.drop(columns=["constructor_id", "squad_id", "team_id"])
+    @property
+    def entities(self) -> list[Base]:
+        return [self.riders, self.constructors, self.teams, self.weekends]
+
+    def _refresh(self, entities: list[Base], timeout) -> list[str]:
+        if not entities:
+            return []
+        with pooled_session(len(entities)) as session, ThreadPoolExecutor(max_workers=len(entities)) as pool:
+            changed = list(pool.map(lambda entity: entity.refresh(session, timeout), entities))
+        return [entity._name for entity, entity_changed in zip(entities, changed) if entity_changed]
+
+    def prefetch(self, timeout=TIMEOUT, stale_ok: bool = False) -> list[str]:
+        """Download every snapshot missing from disk in parallel over one pooled session.
+
+        With ``stale_ok`` only entities with nothing archived at all are fetched; the others serve their latest
+        archived snapshot and revalidate in the background on first use.
+        """
+        missing = [entity for entity in self.entities if not entity.snapshot.exists()]
+        if stale_ok:
+            missing = [entity for entity in missing if entity.snapshot.previous() is None]
+        return self._refresh(missing, timeout)
+
+    def refresh(self, timeout=TIMEOUT) -> list[str]:
+        """Revalidate every snapshot with conditional requests and return the names whose content changed"""
+        return self._refresh(self.entities, timeout)
+
+    def view_stats(self) -> dict[str, dict[str, int]]:
+        """Hit and miss counts of every memoized view, keyed by entity name and view"""
+        ret = {f"fantasy:{key}": counts for key, counts in view_stats(self).items()}
+        for entity in self.entities:
+            ret.update({f"{entity._name}:{key}": counts for key, counts in view_stats(entity).items()})
         return ret
+
+    @view("riders.history", "constructors.history", "teams.history", "weekends.info")
+    def projections(self) -> dict[str, pd.DataFrame]:
+        """Monte Carlo points projection of every rider, constructor and team over the weekends still to come"""
+        upcoming = int((self.weekends.info["end"] > pd.Timestamp.now(tz="UTC")).sum())
+        ret = {}
+        for name, entity in (("riders", self.riders), ("constructors", self.constructors), ("teams", self.teams)):
+            identifier = "Rider" if "Rider" in entity.info.columns else "Name"
+            projection = project(entity.history, entity.info.index, weekends=max(upcoming, 1))
+            projection.insert(0, identifier, entity.info[identifier])
+            ret[name] = projection.sort_values("Projected Points", ascending=False)
+        return ret
+
+    @view("riders.info", "riders.stats", "riders.history", "constructors.info", "teams.info", "weekends.info")
+    def star(self) -> Star:
+        """Rider x event facts keyed by integer positions into rider, constructor, team and weekend dimensions"""
+        riders = self.riders
+        return Star.build(
+            riders.info, riders.stats, riders.history, self.constructors.info, self.teams.info, self.weekends.info
+        )
+
+    @view("star")
+    def rider_full_data(self):
+        """Every rider and event with the rider's info and stats and the constructor, team and weekend names"""
+        return self.star.denormalize()
+
+
+_shared: dict[str, FantasyStats] = {}
+_shared_lock = threading.Lock()
+_scheduler: RefreshScheduler | None = None
+
+
+def shared_stats(ttl: float = SHARED_TTL, schedule: bool = True) -> FantasyStats:
+    """One read-only FantasyStats per snapshot, shared by every session and rerun in this process.
+
+    Entities serve their latest archived snapshot while today's is fetched in the background, so only a process
+    with nothing archived waits for the website. The first call starts the background scheduler (unless
+    ``schedule`` is false), which from then on keeps the shared instance fresh, and a new day keeps serving
+    yesterday's instance until the scheduler swaps today's in. Without it, a new snapshot key replaces the shared
+    instance and an expired TTL revalidates it in the background, so unchanged feeds cost a 304 and keep their
+    parsed data. Callers must not mutate its frames.
+    """
+    version = snapshot_key()
+    with _shared_lock:
+        stats = _shared.get(version)
+        scheduled = _scheduler is not None and _scheduler.is_alive()
+        if stats is None and scheduled and _shared:
+            return next(iter(_shared.values()))
+        if stats is None:
+            _shared.clear()
+            stats = _shared[version] = FantasyStats(version=version)
+            stats.prefetch(stale_ok=True)
+        elif not scheduled and time.monotonic() - stats.created > ttl:
+            for entity in stats.entities:
+                entity.revalidate_in_background()
+            stats.created = time.monotonic()
+    if schedule and not scheduled:
+        start_scheduler()
+    return stats
+
+
+def revalidate_shared_stats() -> FantasyStats:
+    """Refresh today's shared FantasyStats, or prefetch a new day's one and swap it in, without blocking readers"""
+    version = snapshot_key()
+    with _shared_lock:
+        stats = _shared.get(version)
+    if stats is None:
+        stats = FantasyStats(version=version)
+        stats.prefetch()
+        with _shared_lock:
+            _shared.clear()
+            _shared[version] = stats
+    else:
+        stats.refresh()
+    stats.created = time.monotonic()
+    return stats
+
+
+def start_scheduler() -> RefreshScheduler:
+    """Start (once per process) the background thread refreshing the shared FantasyStats around race sessions"""
+    global _scheduler
+    with _shared_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = RefreshScheduler(lambda: Calendar.from_weekends(revalidate_shared_stats().weekends))
+            _scheduler.start()
+        return _scheduler
+
+
+def invalidate_shared_stats():
+    with _shared_lock:
+        _shared.clear()
@@ -0,0 +1,51 @@
+import functools
+import logging
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+# Bump whenever the shape of a cached frame changes so stale files are ignored
+FRAMES_VERSION = 2
+
+_log = logging.getLogger(__name__)
+
+
+class FrameCache:
+    """Parsed frames stored as Parquet next to the snapshot they were built from, keyed by its content hash"""
+
+    def __init__(self, directory: str, key: str):
+        self.directory = directory
+        self.key = f"{key}.v{FRAMES_VERSION}"
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{self.key}.{name}.parquet")
+
+    def get(self, name: str, build):
+        path = self.path(name)
+        try:
+            return pd.read_parquet(path, memory_map=True)
+        except FileNotFoundError:
+            pass
+        df = build()
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                df.to_parquet(f)
+            os.replace(tmp, path)
+        except (pa.ArrowException, TypeError, ValueError) as exc:
+            _log.warning(f"Not caching {name} frame: {exc}")
+            os.remove(tmp)
+        return df
+
+
+def cached_frame(method):
+    """Serve the frame built by ``method`` from the instance's FrameCache, building and storing it on a miss"""
+
+    @functools.wraps(method)
+    def wrapper(self):
+        return self.frames.get(method.__name__, lambda: method(self))
+
+    return wrapper
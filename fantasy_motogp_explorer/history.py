@@ -0,0 +1,33 @@
+from dataclasses import fields
+from operator import attrgetter
+
+import numpy as np
+import pandas as pd
+from data_models.schema import apply_schema
+
+
+def stack_events(index: pd.Index, events: list[list], position: str | None = None) -> pd.DataFrame:
+    """Stack each entity's list of event dataclasses into one long frame in a single pass.
+
+    Rows are ordered by event position and then by entity, and are indexed by the owning entity's ``index`` label.
+    Every field of the event class becomes a column, plus the 1-based event position under ``position`` if given.
+    """
+    counts = np.fromiter(map(len, events), dtype=np.intp, count=len(events))
+    width = counts.max(initial=0)
+    positions, rows = np.nonzero(counts[np.newaxis, :] > np.arange(width)[:, np.newaxis])
+    if (counts == width).all():
+        flat = [event for events_at in zip(*events) for event in events_at]
+    else:
+        flat = [events[row][pos] for pos, row in zip(positions, rows)]
+    if not flat:
+        return pd.DataFrame(index=index[:0])
+    event_class = type(flat[0])
+    columns = [f.name for f in fields(event_class)]
+    data = {}
+    for column, values in zip(columns, zip(*map(attrgetter(*columns), flat))):
+        data[column] = np.array(values)
+        if data[column].dtype.kind not in "biuf":
+            data[column] = pd.Series(np.array(values, dtype=object)).infer_objects().array
+    if position:
+        data[position] = positions + 1
+    return apply_schema(pd.DataFrame(data, index=index.take(rows)), event_class)
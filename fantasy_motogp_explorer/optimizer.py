@@ -0,0 +1,151 @@
+import heapq
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Slack for float costs in $M so that a lineup exactly on budget is never rejected by rounding
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class SquadRules:
+    budget: float
+    riders: int = 2
+    constructors: int = 1
+    teams: int = 1
+    max_riders_per_team: int | None = None
+
+
+def _combinations(pool: pd.DataFrame, count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    picks = np.array(list(itertools.combinations(range(len(pool)), count)), dtype=np.intp).reshape(-1, count)
+    return (
+        pool["cost"].to_numpy(np.float64)[picks].sum(axis=1),
+        pool["points"].to_numpy(np.float64)[picks].sum(axis=1),
+        pool.index.to_numpy()[picks],
+    )
+
+
+class _Frontier:
+    """Every constructor x team combination, sorted by cost, to complete a rider selection in one vectorized step"""
+
+    def __init__(self, constructors: pd.DataFrame, teams: pd.DataFrame, rules: SquadRules):
+        c_cost, c_points, c_ids = _combinations(constructors, rules.constructors)
+        t_cost, t_points, t_ids = _combinations(teams, rules.teams)
+        cost = (c_cost[:, np.newaxis] + t_cost[np.newaxis, :]).ravel()
+        points = (c_points[:, np.newaxis] + t_points[np.newaxis, :]).ravel()
+        order = np.argsort(cost, kind="stable")
+        self.cost = cost[order]
+        self.points = points[order]
+        self.best_points = np.maximum.accumulate(self.points) if len(points) else self.points
+        pairs = np.stack(np.meshgrid(np.arange(len(c_ids)), np.arange(len(t_ids)), indexing="ij"), -1).reshape(-1, 2)
+        self.constructors = c_ids[pairs[order, 0]]
+        self.teams = t_ids[pairs[order, 1]]
+
+    def affordable(self, budget: float) -> int:
+        return int(np.searchsorted(self.cost, budget + _EPSILON, side="right"))
+
+
+def optimize(
+    riders: pd.DataFrame,
+    constructors: pd.DataFrame,
+    teams: pd.DataFrame,
+    rules: SquadRules,
+    top_k: int = 5,
+) -> pd.DataFrame:
+    """The ``top_k`` highest scoring legal lineups, best first.
+
+    Each pool is indexed by entity id with ``cost`` ($M) and ``points`` columns; ``riders`` also needs ``team_id``
+    when ``rules.max_riders_per_team`` is set. Riders are searched depth first in descending points order and a
+    branch is cut as soon as even its best possible completion cannot beat the current k-th best lineup or fit the
+    budget; constructors and teams are completed for all affordable combinations at once.
+    """
+    frontier = _Frontier(constructors, teams, rules)
+    columns = ["Points", "Cost $M", "Riders", "Constructors", "Teams"]
+    if not len(frontier.cost) or len(riders) < rules.riders:
+        return pd.DataFrame(columns=columns)
+    order = np.argsort(-riders["points"].to_numpy(np.float64), kind="stable")
+    ids = riders.index.to_numpy()[order]
+    cost = riders["cost"].to_numpy(np.float64)[order]
+    points = riders["points"].to_numpy(np.float64)[order]
+    team = riders["team_id"].to_numpy()[order] if rules.max_riders_per_team else None
+    points_sum = np.concatenate([[0.0], np.cumsum(points)])
+    cheapest_sum = np.concatenate([[0.0], np.cumsum(np.sort(cost))])
+    frontier_best, frontier_cheapest = frontier.points.max(), frontier.cost[0]
+    heap: list[tuple[float, int, tuple, int]] = []
+    counter = itertools.count()
+
+    def threshold() -> float:
+        return heap[0][0] if len(heap) == top_k else -np.inf
+
+    def complete(chosen: tuple, spent: float, scored: float):
+        affordable = frontier.affordable(rules.budget - spent)
+        if not affordable or scored + frontier.best_points[affordable - 1] <= threshold():
+            return
+        candidates = frontier.points[:affordable]
+        if affordable > top_k:
+            candidates_idx = np.argpartition(candidates, affordable - top_k)[affordable - top_k :]
+        else:
+            candidates_idx = np.arange(affordable)
+        for idx in candidates_idx:
+            total = scored + candidates[idx]
+            entry = (total, next(counter), chosen, int(idx))
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif total > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    def search(start: int, chosen: tuple, spent: float, scored: float):
+        need = rules.riders - len(chosen)
+        if not need:
+            complete(chosen, spent, scored)
+            return
+        for i in range(start, len(ids) - need + 1):
+            if scored + points_sum[i + need] - points_sum[i] + frontier_best <= threshold():
+                break
+            if spent + cost[i] + cheapest_sum[need - 1] + frontier_cheapest > rules.budget + _EPSILON:
+                continue
+            if team is not None and sum(team[j] == team[i] for j in chosen) >= rules.max_riders_per_team:
+                continue
+            search(i + 1, chosen + (i,), spent + cost[i], scored + points[i])
+
+    search(0, (), 0.0, 0.0)
+    rows = []
+    for total, _, chosen, idx in sorted(heap, reverse=True):
+        rows.append(
+            [
+                total,
+                round(cost[list(chosen)].sum() + frontier.cost[idx], 2),
+                tuple(ids[list(chosen)]),
+                tuple(frontier.constructors[idx]),
+                tuple(frontier.teams[idx]),
+            ]
+        )
+    return pd.DataFrame(rows, columns=columns, index=pd.RangeIndex(1, len(rows) + 1, name="Rank"))
+
+
+def pools(stats, points: dict[str, pd.Series] | None = None) -> dict[str, pd.DataFrame]:
+    """Optimizer pools from a FantasyStats, scored on total fantasy points unless ``points`` overrides an entity"""
+    ret = {}
+    for name in ("riders", "constructors", "teams"):
+        entity = getattr(stats, name)
+        pool = entity.info[["Cost $M"]].rename(columns={"Cost $M": "cost"})
+        pool["points"] = (points or {}).get(name, entity.stats["Total Fantasy Points"]).reindex(pool.index).fillna(0)
+        if name == "riders":
+            pool["team_id"] = entity.info["team_id"]
+        ret[name] = pool
+    return ret
+
+
+def best_lineups(stats, rules: SquadRules, top_k: int = 5, points: dict[str, pd.Series] | None = None):
+    """Top lineups for a FantasyStats with entity ids replaced by rider, constructor and team names"""
+    lineups = optimize(**pools(stats, points), rules=rules, top_k=top_k)
+    names = {
+        "Riders": stats.riders.info["Rider"],
+        "Constructors": stats.constructors.info["Name"],
+        "Teams": stats.teams.info["Name"],
+    }
+    for column, labels in names.items():
+        lineups[column] = [tuple(labels.loc[list(ids)]) for ids in lineups[column]]
+    return lineups
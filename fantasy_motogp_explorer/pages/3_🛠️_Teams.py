@@ -1,7 +1,8 @@
 import streamlit as st
+from common.debug import debug_panel
+from common.grid import grid
 from common.resources import logo
-from fantasy import FantasyStats
-from st_aggrid import AgGrid, GridOptionsBuilder
+from fantasy import shared_stats
 
 st.set_page_config(
     page_icon="https://www.motogp.com/resources/v6.3.5/i/svg-files/elements/motogp-logo.svg",
@@ -16,42 +17,16 @@ st.header("Teams 🛠️")
 (t_basic, t_stats, t_history, t_explore) = st.tabs(["Basic Info", "Point Stats", "History", "Explore"])
 
 with st.spinner("Loading data"):
-    data = FantasyStats().teams
+    data = shared_stats().teams
 
 with t_basic:
-    gb = GridOptionsBuilder.from_dataframe(data.info, resizable=True, wrapHeaderText=True, autoHeaderHeight=True)
-    gb.configure_side_bar()
-    gb.configure_first_column_as_index(resizable=True)
-    go = gb.build()
-    for col_def in go["columnDefs"]:
-        name = col_def["field"]
-        col_def["width"] = min(95, 40 + max([len(x) * 7 for x in name.split(" ")]))
-    grid = AgGrid(data.info, go, key="basic", fit_columns_on_grid_load=True, update_on=["stateChanged"])
+    grid(data.info, "basic", data.data_version)
 
 with t_stats:
-    gb = GridOptionsBuilder.from_dataframe(
-        data.stats,
-        resizable=True,
-        wrapHeaderText=True,
-        autoHeaderHeight=True,
-    )
-    gb.configure_side_bar()
-    gb.configure_first_column_as_index(resizable=True)
-    go = gb.build()
-    for col_def in go["columnDefs"]:
-        name = col_def["field"]
-        col_def["width"] = min(95, 40 + max([len(x) * 7 for x in name.split(" ")]))
-    grid = AgGrid(data.stats, go, key="stats", fit_columns_on_grid_load=True, update_on=["stateChanged"])
+    grid(data.stats, "stats", data.data_version)
 
 with t_history:
-    gb = GridOptionsBuilder.from_dataframe(data.history, resizable=True, wrapHeaderText=True, autoHeaderHeight=True)
-    gb.configure_side_bar()
-    gb.configure_first_column_as_index(resizable=True)
-    go = gb.build()
-    for col_def in go["columnDefs"]:
-        name = col_def["field"]
-        col_def["width"] = min(95, 40 + max([len(x) * 7 for x in name.split(" ")]))
-    grid = AgGrid(data.history, go, key="history", fit_columns_on_grid_load=True, update_on=["stateChanged"])
+    grid(data.history, "history", data.data_version)
 
 # with t_explore:
 #     df = data.basic_info
@@ -63,3 +38,5 @@ with t_history:
 #         update_on=["stateChanged"],
 #         enable_enterprise_modules=True,
 #     )
+
+debug_panel()
@@ -0,0 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Samples simulated per NumPy batch; also the unit of work handed to each process
+BATCH = 8192
+SAMPLES = 100_000
+
+
+def _padded(groups: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Ragged per-entity samples as one zero padded (entities, max samples) matrix plus the real counts"""
+    counts = np.array([len(group) for group in groups], dtype=np.int64)
+    ret = np.zeros((len(groups), max(counts.max(initial=0), 1)), dtype=np.float64)
+    for i, group in enumerate(groups):
+        ret[i, : len(group)] = group
+    return ret, counts
+
+
+@dataclass(frozen=True)
+class _Model:
+    """Per-entity event samples to bootstrap from.
+
+    ``base`` holds every event's points; for riders it excludes the race result, which is drawn separately from
+    ``finished`` or ``dnf`` race points according to ``finish_rate``.
+    """
+
+    base: tuple[np.ndarray, np.ndarray]
+    finished: tuple[np.ndarray, np.ndarray] | None = None
+    dnf: tuple[np.ndarray, np.ndarray] | None = None
+    finish_rate: np.ndarray | None = None
+
+    @classmethod
+    def from_history(cls, history: pd.DataFrame, index: pd.Index) -> "_Model":
+        history = history[history["Points"].notna()]
+        groups = {key: group for key, group in history.groupby(level=0, sort=False)}
+        events = [groups.get(key, history.iloc[:0]) for key in index]
+        if "Finished" not in history.columns:
+            return cls(base=_padded([event["Points"].to_numpy(np.float64) for event in events]))
+        finished = [event["Finished"].to_numpy(bool) for event in events]
+        race = [event["Final Points"].fillna(0).to_numpy(np.float64) for event in events]
+        return cls(
+            base=_padded([event["Points"].to_numpy(np.float64) - r for event, r in zip(events, race)]),
+            finished=_padded([r[f] for r, f in zip(race, finished)]),
+            dnf=_padded([r[~f] for r, f in zip(race, finished)]),
+            # Laplace smoothing so a short history never makes a DNF impossible or certain
+            finish_rate=np.array([(f.sum() + 1) / (len(f) + 2) for f in finished]),
+        )
+
+
+def _draw(rng: np.random.Generator, samples: tuple[np.ndarray, np.ndarray], shape: tuple[int, ...]) -> np.ndarray:
+    values, counts = samples
+    idx = (rng.random(shape + (len(counts),)) * counts).astype(np.intp)
+    return values[np.arange(len(counts)), idx]
+
+
+def _simulate(model: _Model, samples: int, weekends: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Total points of every entity over ``weekends`` weekends for ``samples`` draws, shaped (samples, entities)"""
+    rng = np.random.default_rng(seed)
+    shape = (samples,)
+    totals = np.zeros((samples, len(model.base[1])), dtype=np.float64)
+    for _ in range(weekends):
+        totals += _draw(rng, model.base, shape)
+        if model.finish_rate is not None:
+            finished = rng.random(shape + (len(model.finish_rate),)) < model.finish_rate
+            totals += np.where(finished, _draw(rng, model.finished, shape), _draw(rng, model.dnf, shape))
+    return totals
+
+
+def project(
+    history: pd.DataFrame,
+    index: pd.Index,
+    weekends: int = 1,
+    samples: int = SAMPLES,
+    seed: int = 0,
+    processes: int | None = None,
+) -> pd.DataFrame:
+    """Monte Carlo projection of each entity's fantasy points over the next ``weekends`` weekends.
+
+    Every simulated weekend bootstraps one of the entity's past events from ``history``; riders also draw whether
+    they finish from their (smoothed) finish rate and take their race points from a past finish or DNF accordingly.
+    Samples run in batches of ``BATCH`` with independent seeds, spread over ``processes`` worker processes when
+    given, and the result only depends on ``seed``, not on the number of processes.
+    """
+    model = _Model.from_history(history, index)
+    sizes = [min(BATCH, samples - start) for start in range(0, samples, BATCH)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = ([model] * len(sizes), sizes, [weekends] * len(sizes), seeds)
+    if processes and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            totals = np.concatenate(list(pool.map(_simulate, *args)))
+    else:
+        totals = np.concatenate(list(map(_simulate, *args)))
+    quantiles = np.percentile(totals, [10, 50, 90], axis=0)
+    ret = pd.DataFrame(
+        {
+            "Projected Points": totals.mean(axis=0),
+            "Std": totals.std(axis=0),
+            "P10": quantiles[0],
+            "P50": quantiles[1],
+            "P90": quantiles[2],
+        },
+        index=index,
+    )
+    if model.finish_rate is not None:
+        ret["Finish Rate"] = model.finish_rate
+    return ret
@@ -0,0 +1,102 @@
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import pandas as pd
+
+# Seconds to wait after a session ends before its results are fetched
+SETTLE = 5 * 60
+# Refresh interval (seconds) within RECENT seconds of a session ending, during a race weekend, and between rounds
+AFTER_SESSION = 10 * 60
+RECENT = 3 * 60 * 60
+WEEKEND = 30 * 60
+IDLE = 12 * 60 * 60
+# Wait after a failed refresh, and the shortest wait ever scheduled
+RETRY = 5 * 60
+MIN_DELAY = 30
+
+_log = logging.getLogger(__name__)
+
+
+def _epoch(times: pd.Series) -> list[float]:
+    return sorted(t.timestamp() for t in pd.to_datetime(times.dropna(), utc=True))
+
+
+def _windows(starts: pd.Series, ends: pd.Series) -> list[tuple[float, float]]:
+    # Pair each weekend's own start and end, skipping weekends missing either
+    windows = pd.DataFrame({"start": pd.to_datetime(starts, utc=True), "end": pd.to_datetime(ends, utc=True)}).dropna()
+    return sorted((start.timestamp(), end.timestamp()) for start, end in windows.itertuples(index=False))
+
+
+class Calendar:
+    """Session end times and race weekend windows as sorted epoch seconds, searched by bisection"""
+
+    def __init__(self, session_ends: pd.Series, weekend_starts: pd.Series, weekend_ends: pd.Series):
+        self.session_ends = _epoch(session_ends)
+        self.weekends = _windows(weekend_starts, weekend_ends)
+
+    @classmethod
+    def from_weekends(cls, weekends) -> "Calendar":
+        return cls(weekends.events["end"], weekends.info["start"], weekends.info["end"])
+
+    def last_session_end(self, now: float) -> float | None:
+        i = bisect.bisect_right(self.session_ends, now)
+        return self.session_ends[i - 1] if i else None
+
+    def next_session_end(self, now: float) -> float | None:
+        i = bisect.bisect_right(self.session_ends, now)
+        return self.session_ends[i] if i < len(self.session_ends) else None
+
+    def in_weekend(self, now: float) -> bool:
+        i = bisect.bisect_right(self.weekends, (now, float("inf")))
+        return bool(i) and self.weekends[i - 1][1] >= now
+
+    def delay(self, now: float) -> float:
+        """Seconds until the next refresh: often right after sessions, rarely between rounds"""
+        last, upcoming = self.last_session_end(now), self.next_session_end(now)
+        if last is not None and now - last < RECENT:
+            interval = AFTER_SESSION
+        elif self.in_weekend(now):
+            interval = WEEKEND
+        else:
+            interval = IDLE
+        if upcoming is not None:
+            interval = min(interval, upcoming + SETTLE - now)
+        return max(interval, MIN_DELAY)
+
+
+def until_tomorrow(now: datetime | None = None) -> float:
+    """Seconds until local midnight, when the daily snapshot key changes"""
+    now = now or datetime.now()
+    return (datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) - now).total_seconds()
+
+
+class RefreshScheduler(threading.Thread):
+    """Daemon thread calling ``refresh`` whenever the Calendar it returns says new results may be out.
+
+    Runs are also scheduled just after midnight so each day's snapshot is written before the first page load.
+    """
+
+    def __init__(self, refresh: Callable[[], Calendar]):
+        super().__init__(name="refresh-scheduler", daemon=True)
+        self._refresh = refresh
+        self._stopped = threading.Event()
+        self.next_run: float | None = None
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                delay = self._refresh().delay(time.time())
+            except Exception:
+                _log.exception("Scheduled refresh failed")
+                delay = RETRY
+            delay = min(delay, until_tomorrow() + 1)
+            self.next_run = time.time() + delay
+            _log.info(f"Next refresh in {delay / 60:.0f} min")
+            self._stopped.wait(delay)
+
+    def stop(self):
+        self._stopped.set()
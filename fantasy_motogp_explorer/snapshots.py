@@ -0,0 +1,112 @@
+import copy
+import os
+import time
+
+import requests
+from archive import CHUNK, Archive
+from requests.adapters import HTTPAdapter
+from spans import span
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+# (connect, read) timeouts in seconds for every request to the fantasy website
+TIMEOUT = (3.05, 30)
+
+
+def pooled_session(pool_size: int = 4) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class Snapshot:
+    def __init__(self, url: str, name: str, version: str, data_dir: str = DATA_DIR):
+        self.url = url
+        self.name = name
+        self.version = version
+        self.data_dir = data_dir
+        self.directory = os.path.join(data_dir, name)
+        self.archive = Archive(self.directory)
+        self.archive.import_legacy()
+        self._pinned: str | None = None
+
+    def at(self, sha256: str) -> "Snapshot":
+        """This snapshot pinned to the payload ``sha256``, whatever the archive's index says from then on"""
+        pinned = copy.copy(self)
+        pinned._pinned = sha256
+        return pinned
+
+    @property
+    def sha256(self) -> str | None:
+        return self._pinned or self.archive.index().get(self.version)
+
+    @property
+    def path(self) -> str:
+        return self.archive.blob_path(self.sha256)
+
+    def exists(self) -> bool:
+        return self.sha256 is not None
+
+    def load(self):
+        return self.archive.load(self.version)
+
+    def items(self):
+        """Entities of the payload, decoded one at a time"""
+        return self.archive.items(self.sha256)
+
+    def entity(self, entity_id) -> dict:
+        """One entity of the payload by id"""
+        return self.archive.entity(self.sha256, entity_id)
+
+    def meta(self) -> dict:
+        """ETag, Last-Modified and sha256 of the payload"""
+        sha = self.sha256
+        return {"sha256": sha, **self.archive.validators(sha)} if sha else {}
+
+    def previous(self) -> "Snapshot | None":
+        versions = [version for version in self.archive.dates() if version < self.version]
+        return Snapshot(self.url, self.name, versions[-1], self.data_dir) if versions else None
+
+    def refresh(self, session: requests.Session | None = None, timeout=TIMEOUT) -> bool:
+        """Conditionally download the payload and return whether this snapshot's content changed.
+
+        Validators come from this snapshot, or from the latest earlier one when this one is not archived yet,
+        so a 304 (or an identical body) never rewrites or re-parses an unchanged payload. Fetches are single-flight
+        across threads and processes: callers queue on the archive lock and whoever finds that another caller
+        fetched this snapshot while it waited reuses that result instead of downloading again.
+        """
+        requested = time.time()
+        before = self.sha256
+        lock = self.archive.lock()
+        with span("fetch.wait", entity=self.name):
+            lock.acquire()
+        try:
+            if self.archive.fetched(self.version) >= requested:
+                return self.sha256 != before
+            source = self if self.exists() else self.previous()
+            old_meta = source.meta() if source else {}
+            headers = {}
+            if old_meta.get("etag"):
+                headers["If-None-Match"] = old_meta["etag"]
+            if old_meta.get("last_modified"):
+                headers["If-Modified-Since"] = old_meta["last_modified"]
+            # The body is streamed into the archive, so it is never held in memory whole
+            with span("fetch", entity=self.name) as record, (session or requests).get(
+                self.url, headers=headers, timeout=timeout, stream=True
+            ) as response:
+                record["status"] = response.status_code
+                response.raise_for_status()
+                if response.status_code == 304:
+                    sha = old_meta.get("sha256")
+                else:
+                    sha = self.archive.store(response.iter_content(CHUNK))
+            validators = {
+                "etag": response.headers.get("ETag", old_meta.get("etag")),
+                "last_modified": response.headers.get("Last-Modified", old_meta.get("last_modified")),
+            }
+            validators = {k: v for k, v in validators.items() if v}
+            self.archive.add(self.version, sha=sha, validators=validators, fetched=time.time())
+        finally:
+            lock.release()
+        return source is not self or sha != old_meta.get("sha256")
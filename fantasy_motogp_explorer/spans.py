@@ -0,0 +1,98 @@
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Most recent spans kept per stage for percentiles, and overall for export
+WINDOW = 1000
+
+_log = logging.getLogger(__name__)
+
+
+class Spans:
+    """Durations of the pipeline stages run in this process, aggregated per stage.
+
+    Each finished span is also logged as one JSON object on the ``spans`` logger at DEBUG level. Net allocated
+    memory is recorded too when tracemalloc is tracing (e.g. ``PYTHONTRACEMALLOC=1``). Spans nest, so a stage's
+    duration includes the stages it triggered.
+    """
+
+    def __init__(self, window: int = WINDOW):
+        self._lock = threading.Lock()
+        self._stages: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._recent: deque = deque(maxlen=window)
+
+    @contextmanager
+    def span(self, stage: str, **fields):
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        record = {"stage": stage, **fields}
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record["error"] = type(exc).__name__
+            raise
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            if traced is not None:
+                record["allocated_mib"] = (tracemalloc.get_traced_memory()[0] - traced) / 2**20
+            record["thread"] = threading.current_thread().name
+            record["time"] = time.time()
+            with self._lock:
+                self._stages[stage].append(record)
+                self._recent.append(record)
+            _log.debug(json.dumps(record, default=str))
+
+    def export(self) -> list[dict]:
+        """The most recent spans, oldest first"""
+        with self._lock:
+            return list(self._recent)
+
+    def summary(self) -> pd.DataFrame:
+        """Count and duration percentiles (ms) of every stage, slowest total first"""
+        with self._lock:
+            stages = {stage: list(records) for stage, records in self._stages.items()}
+        rows = []
+        for stage, records in stages.items():
+            seconds = np.array([record["seconds"] for record in records]) * 1000
+            p50, p90, p99 = np.percentile(seconds, [50, 90, 99])
+            row = {"Stage": stage, "Count": len(records), "P50": p50, "P90": p90, "P99": p99, "Max": seconds.max()}
+            row["Total"] = seconds.sum()
+            allocated = [record["allocated_mib"] for record in records if "allocated_mib" in record]
+            if allocated:
+                row["Allocated MiB"] = float(np.mean(allocated))
+            rows.append(row)
+        df = pd.DataFrame(rows, columns=["Stage", "Count", "P50", "P90", "P99", "Max", "Total", "Allocated MiB"])
+        if df["Allocated MiB"].isna().all():
+            df = df.drop(columns="Allocated MiB")
+        return df.sort_values("Total", ascending=False, ignore_index=True)
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+
+
+SPANS = Spans()
+span = SPANS.span
+
+
+def timed(stage: str):
+    """Run the decorated method in a span named ``stage``, tagged with the instance's entity name if it has one"""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with span(stage, entity=getattr(self, "_name", None)):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
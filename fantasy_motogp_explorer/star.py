@@ -0,0 +1,101 @@
+"""Star schema of the rider data: rider x event facts with integer keys into rider, constructor, team and weekend
+dimensions, denormalized by positional gathers instead of joins"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+# Key columns of the facts -> dimension they index (by position; -1 where the dimension has no such id)
+KEYS = ("rider", "constructor", "team", "weekend")
+# Column of each dimension named in the denormalized view
+NAMES = {"constructor": ("Name", "Constructor"), "team": ("Name", "Team"), "weekend": ("name", "Weekend")}
+
+_log = logging.getLogger(__name__)
+
+
+def codes(dimension: pd.Index, ids) -> np.ndarray:
+    """Position in ``dimension`` of every id in ``ids``, -1 for ids it does not have"""
+    return dimension.get_indexer(ids).astype(np.int32)
+
+
+def event_weekends(weekends: pd.DataFrame, event_numbers) -> np.ndarray:
+    """Position in ``weekends`` of the weekend of every event number, -1 where no single weekend has that number.
+
+    Rider events carry their number but no weekend id, so they are matched to the weekend with the same ``number``.
+    A number that several weekends share is ambiguous and matches none of them.
+    """
+    numbers = weekends["number"]
+    keyed = (numbers.notna() & ~numbers.duplicated(keep=False)).to_numpy()
+    if not keyed.all():
+        _log.warning(f"{(~keyed).sum()} weekends without a unique number are not matched to any event")
+    found = codes(pd.Index(numbers[keyed]), event_numbers)
+    return np.append(np.flatnonzero(keyed), -1).astype(np.int32)[found]
+
+
+def _values(column: pd.Series):
+    return column.to_numpy() if isinstance(column.dtype, np.dtype) else column.array
+
+
+def gather(dimension: pd.DataFrame, positions: np.ndarray) -> dict:
+    """Columns of the rows of ``dimension`` at ``positions``, with missing values where a position is -1"""
+    return {column: take(_values(dimension[column]), positions, allow_fill=True) for column in dimension.columns}
+
+
+@dataclass(frozen=True)
+class Star:
+    """Facts and dimensions of one snapshot; all frames are read-only.
+
+    ``facts`` holds one row per rider and event, the event's measures and an int32 key per dimension. Dimensions
+    keep their entities' ids as index, and their text columns as categoricals, so denormalized rows only copy codes.
+    """
+
+    facts: pd.DataFrame
+    riders: pd.DataFrame
+    constructors: pd.DataFrame
+    teams: pd.DataFrame
+    weekends: pd.DataFrame
+
+    @classmethod
+    def build(
+        cls,
+        riders: pd.DataFrame,
+        stats: pd.DataFrame,
+        history: pd.DataFrame,
+        constructors: pd.DataFrame,
+        teams: pd.DataFrame,
+        weekends: pd.DataFrame,
+    ) -> "Star":
+        """Model rider ``info``, ``stats`` and ``history`` with the ``info`` of constructors, teams and weekends"""
+        rider = codes(riders.index, history.index)
+        facts = history.drop(columns="Rider").reset_index(drop=True)
+        facts["rider"] = rider
+        facts["constructor"] = codes(constructors.index, riders["constructor_id"]).take(rider)
+        facts["team"] = codes(teams.index, riders["team_id"]).take(rider)
+        facts["weekend"] = event_weekends(weekends, history["Event Num"])
+        dimension = riders.drop(columns=["constructor_id", "squad_id", "team_id"]).join(
+            stats.drop(columns=riders.columns.intersection(stats.columns))
+        )
+        return cls(
+            facts=facts,
+            riders=_categorize(dimension),
+            constructors=_categorize(constructors),
+            teams=_categorize(teams),
+            weekends=_categorize(weekends),
+        )
+
+    def denormalize(self) -> pd.DataFrame:
+        """One row per fact: its rider's columns, the names of its constructor, team and weekend, then its measures"""
+        positions = self.facts["rider"].to_numpy()
+        columns = gather(self.riders, positions)
+        for key, (column, name) in NAMES.items():
+            columns[name] = gather(getattr(self, f"{key}s")[[column]], self.facts[key].to_numpy())[column]
+        columns.update({column: self.facts[column].array for column in self.facts.columns if column not in KEYS})
+        return pd.DataFrame(columns, index=self.riders.index.take(positions), copy=False)
+
+
+def _categorize(dimension: pd.DataFrame) -> pd.DataFrame:
+    text = dimension.select_dtypes("object").columns
+    return dimension.astype({column: "category" for column in text})
@@ -0,0 +1,97 @@
+"""Indexed lookups on per-event history and weekend sessions, answering point and range queries without scanning"""
+
+import numpy as np
+import pandas as pd
+
+_NONE = np.empty(0, dtype=np.intp)
+
+
+class HashIndex:
+    """Row positions of every distinct value of one column"""
+
+    def __init__(self, values):
+        self._positions = pd.DataFrame({"key": values}).groupby("key", observed=True, sort=False).indices
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def keys(self):
+        return self._positions.keys()
+
+    def positions(self, key) -> np.ndarray:
+        return self._positions.get(key, _NONE)
+
+
+class SortedIndex:
+    """Two integer keys of rows sorted by them, searched by bisection"""
+
+    def __init__(self, first, second):
+        self._first = np.asarray(first, dtype=np.int64)
+        self._second = np.asarray(second, dtype=np.int64)
+
+    @staticmethod
+    def order(first, second) -> np.ndarray:
+        """Positions that sort rows by ``first`` and then ``second``"""
+        return np.lexsort((np.asarray(second, dtype=np.int64), np.asarray(first, dtype=np.int64)))
+
+    def slice(self, first: int, start: int | None = None, end: int | None = None) -> slice:
+        """Rows with key ``first`` and a second key in [start, end]"""
+        lo = np.searchsorted(self._first, first, side="left")
+        hi = np.searchsorted(self._first, first, side="right")
+        seconds = self._second[lo:hi]
+        if end is not None:
+            hi = lo + np.searchsorted(seconds, end, side="right")
+        if start is not None:
+            lo = lo + np.searchsorted(seconds, start, side="left")
+        return slice(lo, hi)
+
+
+class HistoryStore:
+    """``BaseStats.history`` clustered by (entity id, event number) and indexed by event number.
+
+    The store keeps its own copy of the rows in key order, so an entity's events are one contiguous slice.
+    """
+
+    def __init__(self, history: pd.DataFrame, event: str = "Event Num"):
+        ids = history.index.to_numpy(dtype=np.int64)
+        events = history[event].to_numpy(dtype=np.int64, na_value=-1)
+        order = SortedIndex.order(ids, events)
+        self.frame = history.iloc[order]
+        self._by_entity = SortedIndex(ids[order], events[order])
+        self._by_event = HashIndex(events[order])
+
+    def entity(self, entity_id: int, start: int | None = None, end: int | None = None) -> pd.DataFrame:
+        """Events ``start`` to ``end`` (inclusive, unbounded if None) of one entity, in event order"""
+        return self.frame.iloc[self._by_entity.slice(entity_id, start, end)]
+
+    def get(self, entity_id: int, event_num: int) -> pd.DataFrame:
+        """The results of one entity at one event; empty if it has none"""
+        return self.entity(entity_id, event_num, event_num)
+
+    def event(self, event_num: int) -> pd.DataFrame:
+        """Every entity's results at one event, in entity id order"""
+        return self.frame.iloc[self._by_event.positions(event_num)]
+
+
+class EventStore:
+    """``Weekends.events`` indexed by weekend id and by session type"""
+
+    def __init__(self, events: pd.DataFrame, session: str = "type"):
+        self.frame = events
+        self._by_weekend = HashIndex(events.index)
+        self._by_session = HashIndex(events[session].array)
+
+    @property
+    def sessions(self) -> list:
+        return list(self._by_session.keys())
+
+    def weekend(self, weekend_id: int) -> pd.DataFrame:
+        """Every session of one weekend"""
+        return self.frame.iloc[self._by_weekend.positions(weekend_id)]
+
+    def session(self, session: str, weekend_id: int | None = None) -> pd.DataFrame:
+        """Every session of one type, e.g. ``"RAC"``, or only those of one weekend"""
+        positions = self._by_session.positions(session)
+        if weekend_id is not None:
+            positions = np.intersect1d(positions, self._by_weekend.positions(weekend_id), assume_unique=True)
+        return self.frame.iloc[positions]
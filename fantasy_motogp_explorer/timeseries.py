@@ -0,0 +1,145 @@
+import glob
+import io
+import json
+import os
+from collections.abc import Iterable
+
+import pandas as pd
+from archive import Archive, FileLock, write_atomic
+
+# Column name -> path into each entity of a feed payload
+SERIES = {
+    "cost": ("cost",),
+    "cost_dynamic": ("stats", "cost_dynamic"),
+    "total_points": ("stats", "total_points"),
+}
+
+
+def _get(datum: dict, path: tuple[str, ...]):
+    for key in path:
+        if not isinstance(datum, dict):
+            return None
+        datum = datum.get(key)
+    return datum
+
+
+def extract(payload: Iterable[dict]) -> pd.DataFrame:
+    """Series values of every entity, in one pass so the payload can be streamed"""
+    ids, rows = [], []
+    for datum in payload:
+        ids.append(datum["id"])
+        rows.append([_get(datum, path) for path in SERIES.values()])
+    return pd.DataFrame(rows, index=pd.Index(ids, name="id"), columns=list(SERIES), dtype="float64")
+
+
+class TimeSeries:
+    """Cost and points of every entity of one feed over time, ingested incrementally from its archive.
+
+    Each ingested date only stores the entities whose values changed since the previous date, in
+    ``<date>.parquet``, plus an ``absent`` row without values for every entity missing from that date's payload.
+    ``state.parquet`` holds the latest values and ``watermark.json`` the payload hash of every ingested date, so
+    ingesting a new day decodes at most one payload regardless of how many days came before. A date archived out of
+    order (a backfill or a legacy import) rewrites the deltas from that date on.
+    """
+
+    def __init__(self, archive: Archive, directory: str):
+        self.archive = archive
+        self.directory = directory
+        self.state_path = os.path.join(directory, "state.parquet")
+        self.watermark_path = os.path.join(directory, "watermark.json")
+
+    def _ingested(self) -> dict[str, str]:
+        """Payload hash of every ingested date"""
+        try:
+            with open(self.watermark_path, "r") as f:
+                watermark = json.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        return watermark["dates"]
+
+    def _state(self) -> pd.DataFrame:
+        try:
+            return pd.read_parquet(self.state_path)
+        except FileNotFoundError:
+            return self._empty_state()
+
+    @staticmethod
+    def _empty_state() -> pd.DataFrame:
+        return pd.DataFrame(columns=list(SERIES), index=pd.Index([], name="id", dtype="int64"), dtype="float64")
+
+    def _replay(self, until: str) -> pd.DataFrame:
+        """The state as of the last date before ``until``, rebuilt from the deltas"""
+        df = self.frame()
+        df = df[df.index.get_level_values("date") < until]
+        if df.empty:
+            return self._empty_state()
+        # Only the values since an entity's last removal make up its state
+        removals = df["absent"].groupby(level="id").cumsum()
+        current = (removals == removals.groupby(level="id").transform("max")) & ~df["absent"]
+        return df.loc[current, list(SERIES)].groupby(level="id").last().astype("float64")
+
+    @staticmethod
+    def _write_parquet(path: str, df: pd.DataFrame):
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        write_atomic(path, buffer.getvalue())
+
+    def ingest(self) -> list[str]:
+        """Ingest every archived date not ingested yet and return the dates (re)written"""
+        with FileLock(os.path.join(self.directory, ".lock")):
+            return self._ingest()
+
+    def _ingest(self) -> list[str]:
+        ingested = self._ingested()
+        index = self.archive.index()
+        pending = [date for date in sorted(index) if ingested.get(date) != index[date]]
+        if not pending:
+            return []
+        os.makedirs(self.directory, exist_ok=True)
+        first = pending[0]
+        before = [date for date in sorted(ingested) if date < first]
+        if len(before) == len(ingested):
+            state = self._state()
+        else:
+            # Deltas after ``first`` were taken against the wrong previous day
+            for path in glob.glob(os.path.join(self.directory, "[0-9]" * 8 + ".parquet")):
+                if os.path.basename(path)[:8] >= first:
+                    os.remove(path)
+            state = self._replay(first)
+        ingested = {date: ingested[date] for date in before}
+        sha = ingested[before[-1]] if before else None
+        dates = [date for date in sorted(index) if date >= first]
+        for date in dates:
+            ingested[date] = index[date]
+            if index[date] == sha:
+                continue
+            sha = index[date]
+            values = extract(self.archive.items(sha))
+            previous = state.reindex(values.index)
+            unchanged = ((values == previous) | (values.isna() & previous.isna())).all(axis=1)
+            removed = state.index.difference(values.index)
+            delta = values[~unchanged].reindex(values.index[~unchanged].append(removed))
+            delta["absent"] = delta.index.isin(removed)
+            if len(delta):
+                self._write_parquet(os.path.join(self.directory, f"{date}.parquet"), delta.assign(date=date))
+            state = values.combine_first(state.drop(removed))
+        self._write_parquet(self.state_path, state)
+        write_atomic(self.watermark_path, json.dumps({"dates": ingested}).encode())
+        return dates
+
+    def frame(self, dense: bool = False) -> pd.DataFrame:
+        """Values indexed by (date, id): only the changes and removals (``absent``), or if ``dense`` every entity
+        present on every ingested date"""
+        paths = sorted(glob.glob(os.path.join(self.directory, "[0-9]" * 8 + ".parquet")))
+        if not paths:
+            index = pd.MultiIndex.from_arrays([[], []], names=["date", "id"])
+            return pd.DataFrame(columns=list(SERIES) if dense else [*SERIES, "absent"], index=index)
+        df = pd.concat([pd.read_parquet(path) for path in paths]).reset_index().set_index(["date", "id"])
+        if dense:
+            dates = pd.Index(sorted(self._ingested()), name="date")
+            wide = df.unstack("id").reindex(dates)
+            absent = wide["absent"].astype("boolean").ffill().fillna(False).astype(bool)
+            values = wide[list(SERIES)].ffill()
+            df = values.mask(absent.reindex(columns=values.columns, level="id").to_numpy())
+            df = df.stack("id", future_stack=True).dropna(how="all")
+        return df.sort_index()
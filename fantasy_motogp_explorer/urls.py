@@ -1,5 +1,9 @@
 base_url = "https://fantasy.motogp.com/json/"
-riders_url = base_url + "riders.json"
-squads_url = base_url + "squads.json"
-events_url = base_url + "events.json"
-constructors_url = base_url + "constructors.json"
+riders_path = "riders.json"
+squads_path = "squads.json"
+events_path = "events.json"
+constructors_path = "constructors.json"
+riders_url = base_url + riders_path
+squads_url = base_url + squads_path
+events_url = base_url + events_path
+constructors_url = base_url + constructors_path
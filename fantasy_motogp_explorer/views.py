@@ -0,0 +1,92 @@
+import threading
+from collections import Counter
+
+from spans import span
+
+
+class view:
+    """A read-only property memoized until the version of one of its dependencies changes.
+
+    Dependencies are attribute paths relative to the instance, e.g. ``"info"`` or ``"riders.all_data"``. A dependency
+    that is itself a view contributes its own dependencies' versions; any other attribute contributes its value, so the
+    chain ends in something cheap such as a snapshot hash. Values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, *depends: str):
+        self.depends = depends
+
+    def __call__(self, func):
+        self.func = func
+        self.key = func.__qualname__
+        self.__doc__ = func.__doc__
+        return self
+
+    def version(self, instance) -> tuple:
+        return tuple(_version(instance, path) for path in self.depends)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with _lock(instance):
+            counts = instance.__dict__.setdefault("_view_stats", {}).setdefault(self.key, Counter())
+            memo = instance.__dict__.setdefault("_views", {})
+            version = self.version(instance)
+            if self.key in memo and memo[self.key][0] == version:
+                counts["hits"] += 1
+                return memo[self.key][1]
+            counts["misses"] += 1
+            with span(self.key, entity=getattr(instance, "_name", None)):
+                value = self.func(instance)
+            memo[self.key] = (version, value)
+            return value
+
+
+class locked_cached_property:
+    """Like ``functools.cached_property``, but built under the instance's view lock.
+
+    Views run under the same lock, so values dropped together with ``drop`` are never seen half replaced by a view.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.name in instance.__dict__:
+            return instance.__dict__[self.name]
+        with _lock(instance):
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.func(instance)
+            return instance.__dict__[self.name]
+
+
+def drop(instance, *names: str):
+    """Forget the ``locked_cached_property`` values ``names`` of ``instance`` at once, between views"""
+    with _lock(instance):
+        for name in names:
+            instance.__dict__.pop(name, None)
+
+
+def _lock(instance) -> threading.RLock:
+    return instance.__dict__.setdefault("_view_lock", threading.RLock())
+
+
+def _version(instance, path: str):
+    *parents, name = path.split(".")
+    for parent in parents:
+        instance = getattr(instance, parent)
+    attr = getattr(type(instance), name, None)
+    if isinstance(attr, view):
+        return attr.version(instance)
+    return getattr(instance, name)
+
+
+def view_stats(instance) -> dict[str, dict[str, int]]:
+    """Hit and miss counts per view of ``instance``"""
+    return {key: dict(counts) for key, counts in instance.__dict__.get("_view_stats", {}).items()}
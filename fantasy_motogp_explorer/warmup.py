@@ -0,0 +1,65 @@
+"""Build the shared data before the first page needs it (run: python warmup.py to fill the on-disk caches at deploy)
+
+Streamlit has no hook for server start, so the welcome page starts prewarming when a session first runs it, not when
+the server boots. Run this module at deploy so even that first session finds the frames on disk.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+# Set FANTASY_PREWARM=0 to skip warming the shared data in the background when the app starts
+PREWARM = os.environ.get("FANTASY_PREWARM", "1") != "0"
+
+# Views each page renders, per FantasyStats entity
+PAGE_VIEWS = {
+    "riders": ("basic_info", "stats", "history"),
+    "constructors": ("info", "stats", "history"),
+    "teams": ("info", "stats", "history"),
+    "weekends": ("info", "events"),
+}
+
+_log = logging.getLogger(__name__)
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def prewarm(stats=None) -> float:
+    """Import the data stack and build every frame the pages show, returning the seconds it took"""
+    start = time.perf_counter()
+    # Deferred so importing this module (and rendering the welcome page) never waits for pandas
+    from fantasy import shared_stats
+
+    stats = stats or shared_stats()
+    for entity, views in PAGE_VIEWS.items():
+        for name in views:
+            getattr(getattr(stats, entity), name)
+    return time.perf_counter() - start
+
+
+def _prewarm_quietly(stats=None):
+    try:
+        _log.info(f"Prewarmed shared data in {prewarm(stats):.2f}s")
+    except Exception:
+        _log.exception("Prewarming shared data failed")
+
+
+def prewarm_in_background(stats=None) -> threading.Thread | None:
+    """Start prewarming (``stats`` or the shared data) on a daemon thread once per process, unless disabled by
+    FANTASY_PREWARM=0"""
+    global _thread
+    if not PREWARM:
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_prewarm_quietly, args=(stats,), name="prewarm", daemon=True)
+            _thread.start()
+        return _thread
+
+
+if __name__ == "__main__":
+    from fantasy import shared_stats
+
+    sys.stdout.write(f"Prewarmed shared data in {prewarm(shared_stats(schedule=False)):.2f}s\n")
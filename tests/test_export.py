@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import synthetic  # noqa: E402
+
+EXPORT = os.path.join(ROOT, "fantasy_motogp_explorer", "export.py")
+FEEDS = {"riders.json": "rider", "squads.json": "team", "constructors.json": "constructor", "events.json": "weekend"}
+
+
+class ExportLegacyLayoutTest(unittest.TestCase):
+    def test_exports_days_stored_as_plain_json(self):
+        payloads = synthetic.payloads(n_riders=5, n_events=3)
+        with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as out_dir:
+            for feed, name in FEEDS.items():
+                os.makedirs(os.path.join(data_dir, name))
+                with open(os.path.join(data_dir, name, "20240101.json"), "w") as f:
+                    f.write(json.dumps(payloads[feed]))
+            result = subprocess.run(
+                [sys.executable, EXPORT, out_dir, "--data-dir", data_dir, "--processes", "1"],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertIn("20240101: 16 views written", result.stdout)
+            self.assertIn("riders.history.parquet", os.listdir(os.path.join(out_dir, "20240101")))
+
+
+if __name__ == "__main__":
+    unittest.main()